@@ -0,0 +1,152 @@
+from functools import cached_property
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from api.domain.models.book import Book, CategoryFacet, PriceBucketFacet, RatingFacet, SearchFacets
+from api.domain.models.stats import CategoryDistribution, CategoryStats, Distribution, PriceHistogramBin, RatingCount, StatsDistribution
+
+DEFAULT_PRICE_EDGES = (20.0, 30.0, 40.0, 50.0)
+MAX_PRICE_EDGES = 50
+DEFAULT_PERCENTILES = (5.0, 25.0, 50.0, 75.0, 95.0)
+MAX_PERCENTILES = 20
+MAX_RATING = 5
+
+
+class CatalogColumns:
+    """Columnar NumPy view of the catalog with dictionary-encoded categories."""
+
+    def __init__(self, books: List[Book]):
+        self.categories, category_codes = np.unique([book.category for book in books], return_inverse=True)
+        self.categories = self.categories.tolist()
+        self.category_codes = category_codes.astype(np.int64)
+        self.prices = np.array([book.price for book in books], dtype=np.float64)
+        self.ratings = np.array([book.rating for book in books], dtype=np.float64)
+        self.rating_codes = np.clip(np.rint(self.ratings), 0, MAX_RATING).astype(np.int64)
+        self.in_stock = np.array([book.availability.lower().startswith('in stock') for book in books], dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def facets(self, rows: np.ndarray, price_edges: Sequence[float] = DEFAULT_PRICE_EDGES) -> SearchFacets:
+        """Count categories, star ratings and price buckets over the given row positions."""
+        rows = np.asarray(rows, dtype=np.int64)
+        edges = np.unique(np.asarray(price_edges, dtype=np.float64))
+
+        category_counts = np.bincount(self.category_codes[rows], minlength=len(self.categories))
+        rating_counts = np.bincount(self.rating_codes[rows], minlength=MAX_RATING + 1)
+        bucket_counts = np.bincount(np.searchsorted(edges, self.prices[rows], side='right'), minlength=len(edges) + 1)
+
+        # Most frequent categories first, ties broken alphabetically like np.unique ordered them
+        category_order = np.argsort(-category_counts, kind='stable')
+        lower_bounds = [0.0] + edges.tolist()
+        upper_bounds = edges.tolist() + [None]
+
+        return SearchFacets(
+            categories=[
+                CategoryFacet(category=self.categories[code], count=int(category_counts[code]))
+                for code in category_order if category_counts[code]
+            ],
+            ratings=[
+                RatingFacet(rating=rating, count=int(count))
+                for rating, count in enumerate(rating_counts) if count
+            ],
+            price_buckets=[
+                PriceBucketFacet(min_price=lower, max_price=upper, count=int(count))
+                for lower, upper, count in zip(lower_bounds, upper_bounds, bucket_counts)
+            ]
+        )
+
+    @cached_property
+    def _price_groups(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Prices sorted by category then price, with each category's group size and start offset."""
+        grouped_prices = self.prices[np.lexsort((self.prices, self.category_codes))]
+        sizes = np.bincount(self.category_codes, minlength=len(self.categories))
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1])).astype(np.int64) if len(sizes) else np.empty(0, dtype=np.int64)
+        return grouped_prices, sizes, starts
+
+    def category_stats(self) -> List[CategoryStats]:
+        """Count, price, rating and stock aggregates per category in order of first appearance."""
+        grouped_prices, sizes, starts = self._price_groups
+        if not len(sizes):
+            return []
+        n_categories = len(self.categories)
+        price_sums = np.bincount(self.category_codes, weights=self.prices, minlength=n_categories)
+        rating_sums = np.bincount(self.category_codes, weights=self.ratings, minlength=n_categories)
+        in_stock = np.bincount(self.category_codes, weights=self.in_stock, minlength=n_categories)
+        min_prices = grouped_prices[starts]
+        max_prices = grouped_prices[starts + sizes - 1]
+
+        _, first_rows = np.unique(self.category_codes, return_index=True)
+        return [
+            CategoryStats(
+                category=self.categories[code],
+                count=int(sizes[code]),
+                average_price=round(float(price_sums[code] / sizes[code]), 2),
+                min_price=float(min_prices[code]),
+                max_price=float(max_prices[code]),
+                average_rating=round(float(rating_sums[code] / sizes[code]), 2),
+                in_stock=int(in_stock[code])
+            )
+            for code in np.argsort(first_rows, kind='stable').tolist()
+        ]
+
+    def distribution(self, bins: int = 10, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> StatsDistribution:
+        """Price percentiles, price histogram and rating counts for the whole catalog and per category."""
+        n_categories = len(self.categories)
+        quantiles = np.asarray(sorted(set(percentiles)), dtype=np.float64) / 100.0
+        edges = np.histogram_bin_edges(self.prices, bins=bins) if len(self) else np.empty(0)
+
+        # Grouping is done on flattened (category, bucket) codes so one bincount covers every category
+        buckets = np.clip(np.searchsorted(edges, self.prices, side='right') - 1, 0, bins - 1)
+        histograms = np.bincount(self.category_codes * bins + buckets, minlength=n_categories * bins).reshape(n_categories, bins)
+        rating_counts = np.bincount(
+            self.category_codes * (MAX_RATING + 1) + self.rating_codes,
+            minlength=n_categories * (MAX_RATING + 1)
+        ).reshape(n_categories, MAX_RATING + 1)
+
+        # Percentiles interpolate linearly between neighbours inside each category group, like np.percentile
+        grouped_prices, sizes, starts = self._price_groups
+        positions = starts[:, None] + quantiles[None, :] * np.maximum(sizes - 1, 0)[:, None]
+        lower = np.floor(positions).astype(np.int64)
+        upper = np.ceil(positions).astype(np.int64)
+        weight = positions - lower
+        category_percentiles = grouped_prices[lower] * (1 - weight) + grouped_prices[upper] * weight if len(self) else positions
+
+        overall = self._distribution(
+            len(self),
+            np.percentile(self.prices, quantiles * 100) if len(self) else [],
+            quantiles,
+            edges,
+            histograms.sum(axis=0),
+            rating_counts.sum(axis=0)
+        )
+        categories = [
+            CategoryDistribution(
+                category=name,
+                **self._distribution(
+                    int(sizes[code]), category_percentiles[code], quantiles, edges, histograms[code], rating_counts[code]
+                ).model_dump()
+            )
+            for code, name in enumerate(self.categories)
+        ]
+        return StatsDistribution(overall=overall, categories=categories)
+
+    @staticmethod
+    def _distribution(
+        count: int,
+        percentile_values: Sequence[float],
+        quantiles: np.ndarray,
+        edges: np.ndarray,
+        histogram: np.ndarray,
+        rating_counts: np.ndarray
+    ) -> Distribution:
+        return Distribution(
+            count=count,
+            price_percentiles={f'p{quantile * 100:g}': round(float(value), 2) for quantile, value in zip(quantiles, percentile_values)},
+            price_histogram=[
+                PriceHistogramBin(min_price=round(float(low), 2), max_price=round(float(high), 2), count=int(bin_count))
+                for low, high, bin_count in zip(edges[:-1], edges[1:], histogram)
+            ],
+            rating_counts=[RatingCount(rating=rating, count=int(rating_count)) for rating, rating_count in enumerate(rating_counts) if rating_count]
+        )
@@ -0,0 +1,86 @@
+from collections import defaultdict
+from typing import Dict, List
+
+from api.domain.models.book import AutocompleteSuggestion, Book
+from api.utils.text import tokenize
+
+MAX_SUGGESTIONS = 20
+
+
+class _TrieNode:
+    __slots__ = ('children', 'top')
+
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.top: List[int] = []
+
+
+class PrefixIndex:
+    """Trie over normalized title and category words with precomputed top suggestions per node."""
+
+    def __init__(self, books: List[Book], max_suggestions: int = MAX_SUGGESTIONS):
+        self.max_suggestions = max_suggestions
+        self._root = _TrieNode()
+        self._suggestions: List[AutocompleteSuggestion] = []
+        self._words: List[frozenset] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._build(books)
+
+    def _build(self, books: List[Book]):
+        ratings_by_category = defaultdict(list)
+        for book in books:
+            ratings_by_category[book.category].append(book.rating)
+
+        entries = [AutocompleteSuggestion(text=book.title, type='book', rating=book.rating, book_id=book.id) for book in books]
+        entries.extend(
+            AutocompleteSuggestion(text=category, type='category', rating=round(sum(ratings) / len(ratings), 2))
+            for category, ratings in ratings_by_category.items()
+        )
+        # Inserting entries best-first means each node's top list fills with its highest ranked entries
+        entries.sort(key=lambda entry: (-entry.rating, entry.text))
+
+        for entry_id, entry in enumerate(entries):
+            words = frozenset(tokenize(entry.text))
+            self._suggestions.append(entry)
+            self._words.append(words)
+            for word in words:
+                self._postings[word].append(entry_id)
+                self._insert(word, entry_id)
+
+    def _insert(self, word: str, entry_id: int):
+        node = self._root
+        for char in word:
+            node = node.children.setdefault(char, _TrieNode())
+            if len(node.top) < self.max_suggestions and (not node.top or node.top[-1] != entry_id):
+                node.top.append(entry_id)
+
+    def _find(self, prefix: str) -> _TrieNode | None:
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[AutocompleteSuggestion]:
+        """Return up to `limit` suggestions whose words match the typed prefix, best rated first."""
+        tokens = tokenize(prefix)
+        if not tokens:
+            return []
+        limit = min(limit, self.max_suggestions)
+        *complete_words, partial = tokens
+
+        if not complete_words:
+            node = self._find(partial)
+            return [self._suggestions[entry_id] for entry_id in node.top[:limit]] if node else []
+
+        # Earlier words must match exactly: walk the rarest posting list and check the rest
+        postings = sorted((self._postings.get(word, []) for word in set(complete_words)), key=len)
+        others = [set(posting) for posting in postings[1:]]
+        results = []
+        for entry_id in postings[0]:
+            if all(entry_id in other for other in others) and any(word.startswith(partial) for word in self._words[entry_id]):
+                results.append(self._suggestions[entry_id])
+                if len(results) >= limit:
+                    break
+        return results
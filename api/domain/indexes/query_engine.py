@@ -0,0 +1,106 @@
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from api.domain.indexes.catalog_columns import CatalogColumns
+from api.domain.indexes.sort_index import SortIndex
+from api.domain.indexes.trigram_index import TrigramIndex
+from api.domain.models.book import Book, BookQuery
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+class _SortedColumn:
+    """Positions ordered by a numeric column, so a range lookup is two binary searches."""
+
+    def __init__(self, values: np.ndarray):
+        self.order = np.argsort(values, kind='stable')
+        self.sorted_values = values[self.order]
+
+    def bounds(self, low: float | None, high: float | None) -> Tuple[int, int]:
+        start = 0 if low is None else int(np.searchsorted(self.sorted_values, low, side='left'))
+        end = len(self.order) if high is None else int(np.searchsorted(self.sorted_values, high, side='right'))
+        return start, max(start, end)
+
+
+class BookQueryEngine:
+    """Combines search filters by seeding candidates from the most selective index and filtering the rest."""
+
+    def __init__(self, books: List[Book], columns: CatalogColumns, trigrams: TrigramIndex, sort_index: SortIndex):
+        self.columns = columns
+        self.trigrams = trigrams
+        self.sort_index = sort_index
+        self.titles = [book.title.lower() for book in books]
+
+        category_order = np.argsort(columns.category_codes, kind='stable')
+        category_sizes = np.bincount(columns.category_codes, minlength=len(columns.categories))
+        self._category_rows = np.split(category_order, np.cumsum(category_sizes)[:-1])
+        self._prices = _SortedColumn(columns.prices)
+        self._ratings = _SortedColumn(columns.ratings)
+
+    def _category_codes(self, category: str) -> List[int]:
+        category = category.lower()
+        return [code for code, name in enumerate(self.columns.categories) if category in name.lower()]
+
+    def _plan(self, query: BookQuery) -> Tuple[str, Callable[[], np.ndarray]]:
+        """Pick the index with the smallest estimated candidate set."""
+        options: List[Tuple[int, str, Callable[[], np.ndarray]]] = []
+
+        if query.category:
+            codes = self._category_codes(query.category)
+            size = sum(len(self._category_rows[code]) for code in codes)
+            options.append((size, 'category', lambda: np.sort(np.concatenate([self._category_rows[code] for code in codes] or [_EMPTY]))))
+
+        if query.min_price is not None or query.max_price is not None:
+            price_start, price_end = self._prices.bounds(query.min_price, query.max_price)
+            options.append((price_end - price_start, 'price', lambda: np.sort(self._prices.order[price_start:price_end])))
+
+        if query.min_rating is not None:
+            rating_start, rating_end = self._ratings.bounds(query.min_rating, None)
+            options.append((rating_end - rating_start, 'rating', lambda: np.sort(self._ratings.order[rating_start:rating_end])))
+
+        if query.title:
+            size = self.trigrams.estimate(query.title)
+            if size is not None:
+                options.append((size, 'title', lambda: self.trigrams.candidates(query.title)))
+
+        if not options:
+            return 'full_scan', lambda: np.arange(len(self.columns), dtype=np.int64)
+        _, index, candidates = min(options, key=lambda option: option[0])
+        return index, candidates
+
+    def _filter(self, rows: np.ndarray, query: BookQuery, index: str) -> np.ndarray:
+        """Apply every predicate the chosen index did not already guarantee."""
+        columns = self.columns
+        mask = np.ones(len(rows), dtype=bool)
+        if query.category and index != 'category':
+            mask &= np.isin(columns.category_codes[rows], self._category_codes(query.category))
+        if query.min_price is not None and index != 'price':
+            mask &= columns.prices[rows] >= query.min_price
+        if query.max_price is not None and index != 'price':
+            mask &= columns.prices[rows] <= query.max_price
+        if query.min_rating is not None and index != 'rating':
+            mask &= columns.ratings[rows] >= query.min_rating
+        if query.available is not None:
+            mask &= columns.in_stock[rows] == query.available
+        rows = rows[mask]
+
+        # Substring matching is the only per-row Python check, so it runs last on the smallest set
+        if query.title:
+            title = query.title.lower()
+            rows = rows[[title in self.titles[row] for row in rows.tolist()]] if len(rows) else rows
+        return rows
+
+    def execute(self, query: BookQuery) -> Tuple[np.ndarray, int, str]:
+        """Return the requested page of matching positions, the total match count and the seeding index."""
+        index, candidates = self._plan(query)
+        # A title too short for the trigram index also plans as a full scan, so the title has to be checked too
+        if index == 'full_scan' and not query.title and query.available is None and query.sort:
+            # Nothing to filter: the page is a slice of the precomputed ordering
+            return self.sort_index.page(None, query.sort, query.order, query.offset, query.limit), len(self.columns), index
+
+        rows = self._filter(np.asarray(candidates(), dtype=np.int64), query, index)
+        if query.sort:
+            return self.sort_index.page(rows, query.sort, query.order, query.offset, query.limit), len(rows), index
+        end = query.offset + query.limit if query.limit else len(rows)
+        return rows[query.offset:end], len(rows), index
@@ -0,0 +1,55 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from api.domain.indexes.catalog_columns import CatalogColumns
+from api.domain.models.book import Book
+
+SORT_FIELDS = ('price', 'rating', 'title')
+
+
+class SortIndex:
+    """Precomputed orderings per sort field and direction, with ties broken by catalog position."""
+
+    def __init__(self, books: List[Book], columns: CatalogColumns):
+        positions = np.arange(len(books), dtype=np.int64)
+        _, title_keys = np.unique([book.title.lower() for book in books], return_inverse=True)
+        keys = {
+            'price': columns.prices,
+            'rating': columns.ratings,
+            'title': title_keys.astype(np.float64),
+        }
+
+        self._orders: Dict[Tuple[str, str], np.ndarray] = {}
+        self._ranks: Dict[Tuple[str, str], np.ndarray] = {}
+        for field, key in keys.items():
+            for direction, signed_key in (('asc', key), ('desc', -key)):
+                ordering = np.lexsort((positions, signed_key))
+                ranks = np.empty_like(ordering)
+                ranks[ordering] = positions
+                self._orders[(field, direction)] = ordering
+                self._ranks[(field, direction)] = ranks
+
+    def page(
+        self,
+        rows: Optional[np.ndarray],
+        field: str,
+        direction: str = 'asc',
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> np.ndarray:
+        """Return one page of positions in sort order; rows=None means the whole catalog."""
+        if rows is None:
+            ordering = self._orders[(field, direction)]
+            return ordering[offset:offset + limit] if limit else ordering[offset:]
+
+        rows = np.asarray(rows, dtype=np.int64)
+        ranks = self._ranks[(field, direction)][rows]
+        end = offset + limit if limit else len(rows)
+        if end < len(rows):
+            # Ranks are unique, so selecting the first `end` is exact and costs O(n + k log k)
+            selected = np.argpartition(ranks, end - 1)[:end]
+            selected = selected[np.argsort(ranks[selected])]
+        else:
+            selected = np.argsort(ranks)
+        return rows[selected[offset:end]]
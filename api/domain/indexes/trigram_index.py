@@ -0,0 +1,40 @@
+from collections import defaultdict
+from typing import Dict, List
+
+import numpy as np
+
+from api.domain.models.book import Book
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """Posting lists of catalog positions per lowercased title trigram, for substring candidates."""
+
+    def __init__(self, books: List[Book]):
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for row, book in enumerate(books):
+            for gram in _trigrams(book.title.lower()):
+                postings[gram].append(row)
+        self._postings = {gram: np.array(rows, dtype=np.int64) for gram, rows in postings.items()}
+
+    def estimate(self, text: str) -> int | None:
+        """Upper bound on the candidates for a substring, or None when it is too short to use the index."""
+        grams = _trigrams(text.lower())
+        if not grams:
+            return None
+        return min(len(self._postings.get(gram, _EMPTY)) for gram in grams)
+
+    def candidates(self, text: str) -> np.ndarray:
+        """Sorted positions whose title contains every trigram of the substring."""
+        postings = sorted((self._postings.get(gram, _EMPTY) for gram in _trigrams(text.lower())), key=len)
+        rows = postings[0]
+        for posting in postings[1:]:
+            if not len(rows):
+                break
+            rows = np.intersect1d(rows, posting, assume_unique=True)
+        return rows
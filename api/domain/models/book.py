@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel
 
@@ -11,6 +11,53 @@ class Book(BaseModel):
     rating: float
     availability: str
     image: Optional[str] = None
+    url: Optional[str] = None
+    upc: Optional[str] = None
+    description: Optional[str] = None
+    stock: Optional[int] = None
 
 class BookListResponse(BaseModel):
-    books: List[Book]
\ No newline at end of file
+    books: List[Book]
+
+class AutocompleteSuggestion(BaseModel):
+    text: str
+    type: str
+    rating: float
+    book_id: Optional[str] = None
+
+class CategoryFacet(BaseModel):
+    category: str
+    count: int
+
+class RatingFacet(BaseModel):
+    rating: int
+    count: int
+
+class PriceBucketFacet(BaseModel):
+    min_price: float
+    max_price: Optional[float] = None
+    count: int
+
+class SearchFacets(BaseModel):
+    categories: List[CategoryFacet]
+    ratings: List[RatingFacet]
+    price_buckets: List[PriceBucketFacet]
+
+class FacetedBookListResponse(BookListResponse):
+    facets: SearchFacets
+
+class BookQuery(BaseModel):
+    title: Optional[str] = None
+    category: Optional[str] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    min_rating: Optional[float] = None
+    available: Optional[bool] = None
+    sort: Optional[Literal['price', 'rating', 'title']] = None
+    order: Literal['asc', 'desc'] = 'asc'
+    offset: int = 0
+    limit: Optional[int] = None
+
+class BookQueryResponse(BookListResponse):
+    total: int
+    index: str
@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+
+class ScrapeJob(BaseModel):
+    id: str
+    status: Literal['running', 'succeeded', 'failed']
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    elapsed_seconds: float
+    pages: int
+    books: int
+    pages_per_second: float
+    books_per_second: float
+    result: Optional[str] = None
+    error: Optional[str] = None
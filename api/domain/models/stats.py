@@ -1,3 +1,5 @@
+from typing import Dict, List
+
 from pydantic import BaseModel
 
 
@@ -9,4 +11,36 @@ class StatsOverview(BaseModel):
 
 class CategoryStats(BaseModel):
     category: str
-    count: int
\ No newline at end of file
+    count: int
+    average_price: float
+    min_price: float
+    max_price: float
+    average_rating: float
+    in_stock: int
+
+
+class PriceHistogramBin(BaseModel):
+    min_price: float
+    max_price: float
+    count: int
+
+
+class RatingCount(BaseModel):
+    rating: int
+    count: int
+
+
+class Distribution(BaseModel):
+    count: int
+    price_percentiles: Dict[str, float]
+    price_histogram: List[PriceHistogramBin]
+    rating_counts: List[RatingCount]
+
+
+class CategoryDistribution(Distribution):
+    category: str
+
+
+class StatsDistribution(BaseModel):
+    overall: Distribution
+    categories: List[CategoryDistribution]
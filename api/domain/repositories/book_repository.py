@@ -1,6 +1,10 @@
 from abc import ABC, abstractmethod
 from typing import List
 
+from api.domain.indexes.catalog_columns import CatalogColumns
+from api.domain.indexes.prefix_index import PrefixIndex
+from api.domain.indexes.query_engine import BookQueryEngine
+from api.domain.indexes.sort_index import SortIndex
 from api.domain.models.book import Book
 
 
@@ -10,4 +14,29 @@ class BookRepository(ABC):
     @abstractmethod
     def get_books_list(self) -> List[Book]:
         """Get books data as a list of Book models."""
-        pass 
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def get_catalog_version(self) -> str:
+        """Get an identifier that changes whenever the catalog data changes."""
+        pass
+
+    @abstractmethod
+    def get_prefix_index(self) -> PrefixIndex:
+        """Get the autocomplete prefix index for the current catalog."""
+        pass
+
+    @abstractmethod
+    def get_catalog_columns(self) -> CatalogColumns:
+        """Get the columnar view of the current catalog."""
+        pass
+
+    @abstractmethod
+    def get_query_engine(self) -> BookQueryEngine:
+        """Get the multi-filter query engine for the current catalog."""
+        pass
+
+    @abstractmethod
+    def get_sort_index(self) -> SortIndex:
+        """Get the precomputed sort orderings for the current catalog."""
+        pass
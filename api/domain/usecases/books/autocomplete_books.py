@@ -0,0 +1,13 @@
+from api.domain.repositories.book_repository import BookRepository
+from api.domain.models.book import AutocompleteSuggestion
+
+
+class AutocompleteBooksUseCase:
+    """Use case for suggesting book titles and categories while the user types."""
+    
+    def __init__(self, book_repository: BookRepository):
+        self.repository = book_repository
+    
+    def execute(self, prefix: str, limit: int = 10) -> list[AutocompleteSuggestion]:
+        """Execute the use case to get the best rated suggestions for a prefix."""
+        return self.repository.get_prefix_index().suggest(prefix, limit)
@@ -1,3 +1,4 @@
+from typing import Optional
 from api.domain.repositories.book_repository import BookRepository
 from api.domain.models.book import Book
 
@@ -8,6 +9,16 @@ class GetAllBooksUseCase:
     def __init__(self, book_repository: BookRepository):
         self.repository = book_repository
     
-    def execute(self) -> list[Book]:
-        """Execute the use case to get all books."""
-        return self.repository.get_books_list()
\ No newline at end of file
+    def execute(
+        self,
+        sort: Optional[str] = None,
+        order: str = 'asc',
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> list[Book]:
+        """Execute the use case to get all books, optionally sorted and paginated."""
+        books = self.repository.get_books_list()
+        if sort:
+            page = self.repository.get_sort_index().page(None, sort, order, offset, limit)
+            return [books[position] for position in page.tolist()]
+        return books[offset:offset + limit] if limit else books[offset:]
@@ -1,6 +1,7 @@
 from typing import Optional
 from api.domain.repositories.book_repository import BookRepository
 from api.domain.models.book import Book
+from api.utils.query_cache import query_cache
 
 
 class GetByPriceUseCase:
@@ -11,9 +12,12 @@ class GetByPriceUseCase:
     
     def execute(self, min_price: Optional[float] = None, max_price: Optional[float] = None) -> list[Book]:
         """Execute the use case to filter books by price range."""
+        key = query_cache.make_key('books.price_range', self.repository.get_catalog_version(), min_price=min_price, max_price=max_price)
+        return query_cache.get_or_compute(key, lambda: self._filter(min_price, max_price))
+
+    def _filter(self, min_price: Optional[float], max_price: Optional[float]) -> list[Book]:
         books = self.repository.get_books_list()
         filtered_books = []
-        print(min_price, max_price)
         
         for book in books:
             if min_price is not None and book.price < min_price:
@@ -1,3 +1,4 @@
+from typing import Optional
 from api.domain.repositories.book_repository import BookRepository
 from api.domain.models.book import Book
 
@@ -8,10 +9,8 @@ class GetTopRatedBooksUseCase:
     def __init__(self, book_repository: BookRepository):
         self.repository = book_repository
     
-    def execute(self, limit: int = 10) -> list[Book]:
+    def execute(self, limit: Optional[int] = 10) -> list[Book]:
         """Execute the use case to get top rated books with optional limit."""
         books = self.repository.get_books_list()
-        books_sorted = sorted(books, key=lambda x: x.rating, reverse=True)
-        if limit > 0:
-            return books_sorted[:limit]
-        return books_sorted
\ No newline at end of file
+        page = self.repository.get_sort_index().page(None, 'rating', 'desc', limit=limit if limit and limit > 0 else None)
+        return [books[position] for position in page.tolist()]
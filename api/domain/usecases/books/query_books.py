@@ -0,0 +1,23 @@
+from api.domain.repositories.book_repository import BookRepository
+from api.domain.models.book import BookQuery, BookQueryResponse
+from api.utils.query_cache import query_cache
+
+
+class QueryBooksUseCase:
+    """Use case for querying books with any combination of filters."""
+    
+    def __init__(self, book_repository: BookRepository):
+        self.repository = book_repository
+    
+    def execute(self, query: BookQuery) -> BookQueryResponse:
+        """Execute the use case to filter, sort and limit books in a single pass over the catalog indexes."""
+        params = query.model_dump()
+        if not query.sort:
+            params['order'] = None
+        key = query_cache.make_key('books.query', self.repository.get_catalog_version(), **params)
+        return query_cache.get_or_compute(key, lambda: self._query(query))
+
+    def _query(self, query: BookQuery) -> BookQueryResponse:
+        books = self.repository.get_books_list()
+        page, total, index = self.repository.get_query_engine().execute(query)
+        return BookQueryResponse(books=[books[row] for row in page.tolist()], total=total, index=index)
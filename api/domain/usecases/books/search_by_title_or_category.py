@@ -1,6 +1,10 @@
 from typing import Optional
+
+import numpy as np
+
 from api.domain.repositories.book_repository import BookRepository
 from api.domain.models.book import Book
+from api.utils.query_cache import query_cache
 
 
 class SearchByTitleOrCategoryUseCase:
@@ -9,25 +13,53 @@ class SearchByTitleOrCategoryUseCase:
     def __init__(self, book_repository: BookRepository):
         self.repository = book_repository
     
-    def execute(self, title: Optional[str] = None, category: Optional[str] = None) -> list[Book]:
-        """Execute the use case to search books by title and/or category."""
+    def find_rows(self, title: Optional[str] = None, category: Optional[str] = None) -> list[int]:
+        """Find the catalog positions of books matching the title and/or category."""
         books = self.repository.get_books_list()
+        title = title.lower() if title else None
+        category = category.lower() if category else None
 
-        if title and category:
-            return [
-                book for book in books 
-                if title.lower() in book.title.lower() 
-                and category.lower() in book.category.lower()
-            ]
-        elif title:
-            return [
-                book for book in books 
-                if title.lower() in book.title.lower()
-            ]
-        elif category:
-            return [
-                book for book in books 
-                if category.lower() in book.category.lower()
-            ]
+        return [
+            position for position, book in enumerate(books)
+            if (not title or title in book.title.lower())
+            and (not category or category in book.category.lower())
+        ]
 
-        return books
\ No newline at end of file
+    def execute(
+        self,
+        title: Optional[str] = None,
+        category: Optional[str] = None,
+        sort: Optional[str] = None,
+        order: str = 'asc',
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> list[Book]:
+        """Execute the use case to search books by title and/or category, optionally sorted and paginated."""
+        key = query_cache.make_key(
+            'books.search',
+            self.repository.get_catalog_version(),
+            title=title,
+            category=category,
+            sort=sort,
+            order=order if sort else None,
+            offset=offset,
+            limit=limit
+        )
+        return query_cache.get_or_compute(key, lambda: self._search(title, category, sort, order, offset, limit))
+
+    def _search(
+        self,
+        title: Optional[str],
+        category: Optional[str],
+        sort: Optional[str],
+        order: str,
+        offset: int,
+        limit: Optional[int]
+    ) -> list[Book]:
+        books = self.repository.get_books_list()
+        rows = self.find_rows(title, category) if title or category else range(len(books))
+        if sort:
+            rows = self.repository.get_sort_index().page(np.asarray(rows, dtype=np.int64), sort, order, offset, limit).tolist()
+        else:
+            rows = rows[offset:offset + limit] if limit else rows[offset:]
+        return [books[position] for position in rows]
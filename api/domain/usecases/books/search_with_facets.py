@@ -0,0 +1,59 @@
+from typing import Optional, Sequence
+
+import numpy as np
+
+from api.domain.indexes.catalog_columns import DEFAULT_PRICE_EDGES
+from api.domain.repositories.book_repository import BookRepository
+from api.domain.models.book import FacetedBookListResponse
+from api.domain.usecases.books.search_by_title_or_category import SearchByTitleOrCategoryUseCase
+from api.utils.query_cache import query_cache
+
+
+class SearchBooksWithFacetsUseCase:
+    """Use case for searching books and counting facets over the matches."""
+    
+    def __init__(self, book_repository: BookRepository):
+        self.repository = book_repository
+    
+    def execute(
+        self,
+        title: Optional[str] = None,
+        category: Optional[str] = None,
+        price_edges: Sequence[float] = DEFAULT_PRICE_EDGES,
+        sort: Optional[str] = None,
+        order: str = 'asc',
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> FacetedBookListResponse:
+        """Execute the use case to search books and return category, rating and price facets over every match."""
+        key = query_cache.make_key(
+            'books.search_facets',
+            self.repository.get_catalog_version(),
+            title=title,
+            category=category,
+            price_edges=sorted(set(price_edges)),
+            sort=sort,
+            order=order if sort else None,
+            offset=offset,
+            limit=limit
+        )
+        return query_cache.get_or_compute(key, lambda: self._search(title, category, price_edges, sort, order, offset, limit))
+
+    def _search(
+        self,
+        title: Optional[str],
+        category: Optional[str],
+        price_edges: Sequence[float],
+        sort: Optional[str],
+        order: str,
+        offset: int,
+        limit: Optional[int]
+    ) -> FacetedBookListResponse:
+        books = self.repository.get_books_list()
+        rows = SearchByTitleOrCategoryUseCase(self.repository).find_rows(title, category)
+        facets = self.repository.get_catalog_columns().facets(rows, price_edges)
+        if sort:
+            page = self.repository.get_sort_index().page(np.asarray(rows, dtype=np.int64), sort, order, offset, limit).tolist()
+        else:
+            page = rows[offset:offset + limit] if limit else rows[offset:]
+        return FacetedBookListResponse(books=[books[position] for position in page], facets=facets)
@@ -1,4 +1,6 @@
+from api.domain.models.stats import CategoryStats
 from api.domain.repositories.book_repository import BookRepository
+from api.utils.query_cache import query_cache
 
 
 class GetCategoriesStatsUseCase:
@@ -7,20 +9,7 @@ class GetCategoriesStatsUseCase:
     def __init__(self, book_repository: BookRepository):
         self.repository = book_repository
     
-    def execute(self):
+    def execute(self) -> list[CategoryStats]:
         """Execute the use case to get statistics by category."""
-        books = self.repository.get_books_list()
-        
-        category_counts = {}
-        for book in books:
-            category = book.category
-            category_counts[category] = category_counts.get(category, 0) + 1
-        
-        stats = []
-        for category, count in category_counts.items():
-            stats.append({
-                'category': category,
-                'count': count
-            })
-        
-        return stats
\ No newline at end of file
+        key = query_cache.make_key('stats.categories', self.repository.get_catalog_version())
+        return query_cache.get_or_compute(key, lambda: self.repository.get_catalog_columns().category_stats())
@@ -0,0 +1,23 @@
+from typing import Sequence
+
+from api.domain.indexes.catalog_columns import DEFAULT_PERCENTILES
+from api.domain.models.stats import StatsDistribution
+from api.domain.repositories.book_repository import BookRepository
+from api.utils.query_cache import query_cache
+
+
+class GetDistributionStatsUseCase:
+    """Use case for getting price and rating distributions overall and by category."""
+    
+    def __init__(self, book_repository: BookRepository):
+        self.repository = book_repository
+    
+    def execute(self, bins: int = 10, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> StatsDistribution:
+        """Execute the use case to get price percentiles, price histograms and rating counts."""
+        key = query_cache.make_key(
+            'stats.distribution',
+            self.repository.get_catalog_version(),
+            bins=bins,
+            percentiles=sorted(set(percentiles))
+        )
+        return query_cache.get_or_compute(key, lambda: self.repository.get_catalog_columns().distribution(bins, percentiles))
@@ -1,18 +1,32 @@
 import os
+import threading
+from typing import Optional
 
 import pandas as pd
 from fastapi import HTTPException
 
+from api.domain.indexes.catalog_columns import CatalogColumns
+from api.domain.indexes.prefix_index import PrefixIndex
+from api.domain.indexes.query_engine import BookQueryEngine
+from api.domain.indexes.sort_index import SortIndex
+from api.domain.indexes.trigram_index import TrigramIndex
 from api.domain.models.book import Book
 from api.domain.repositories.book_repository import BookRepository
+from api.infra.repositories.catalog_holder import CatalogHolder
+from api.infra.repositories.catalog_snapshot import CatalogSnapshot
 
 
 class BookRepositoryImpl(BookRepository):
     """Repository implementation for book data operations."""
-    
+
+    # Shared across instances so a new repository per request reuses the parsed CSV and its indexes
+    _holders: dict[str, CatalogHolder] = {}
+    _holders_lock = threading.Lock()
+
     def __init__(self):
         self.csv_path = os.path.join("data", "books.csv")
-        
+        self._snapshot: Optional[CatalogSnapshot] = None
+
     def _to_model(self, row: pd.Series) -> Book:
         return Book(
             id=str(row.get('id', '')),
@@ -21,29 +35,104 @@ class BookRepositoryImpl(BookRepository):
             price=float(row.get('price', 0.0)),
             rating=float(row.get('rating', 0.0)),
             availability=str(row.get('availability', '')),
-            image=str(row.get('image', '')) if pd.notna(row.get('image')) else None
-        )   
-    
+            image=str(row.get('image', '')) if pd.notna(row.get('image')) else None,
+            url=str(row.get('url')) if pd.notna(row.get('url')) else None,
+            upc=str(row.get('upc')) if pd.notna(row.get('upc')) else None,
+            description=str(row.get('description')) if pd.notna(row.get('description')) else None,
+            stock=int(row.get('stock')) if pd.notna(row.get('stock')) else None
+        )
+
     def _get_books_dataframe(self) -> pd.DataFrame:
         """Load books data from CSV file."""
         if not os.path.exists(self.csv_path):
             raise HTTPException(status_code=500, detail="Arquivo de dados não encontrado")
-        
+
         try:
             df = pd.read_csv(self.csv_path)
             return df
         except Exception as e:
             raise HTTPException(
-                status_code=500, 
+                status_code=500,
                 detail=f'Erro ao carregar CSV: {str(e)}'
             ) from e
-    
+
+    def _get_csv_version(self) -> str:
+        """Identify the CSV contents by modification time and size."""
+        if not os.path.exists(self.csv_path):
+            raise HTTPException(status_code=500, detail="Arquivo de dados não encontrado")
+        stat = os.stat(self.csv_path)
+        return f'{stat.st_mtime_ns}-{stat.st_size}'
+
+    def _get_holder(self) -> CatalogHolder:
+        holder = self._holders.get(self.csv_path)
+        if holder is None:
+            with self._holders_lock:
+                holder = self._holders.get(self.csv_path)
+                if holder is None:
+                    # Loads go through an instance of their own, which never pins a snapshot that would then outlive its version
+                    holder = CatalogHolder(BookRepositoryImpl()._load_snapshot)
+                    self._holders[self.csv_path] = holder
+        return holder
+
+    def _load_snapshot(self, version: str) -> CatalogSnapshot:
+        """Parse the CSV and build every index, so the snapshot is ready to serve when it is swapped in."""
+        while True:
+            df = self._get_books_dataframe()
+            # A file rewritten in place while it was read is read again rather than served half-written
+            current_version = self._get_csv_version()
+            if current_version == version:
+                break
+            version = current_version
+
+        snapshot = CatalogSnapshot(version, [self._to_model(row) for _, row in df.iterrows()])
+        self._get_prefix_index(snapshot)
+        self._get_query_engine(snapshot)
+        self._get_catalog_columns(snapshot).category_stats()
+        return snapshot
+
+    def _get_snapshot(self) -> CatalogSnapshot:
+        """Get the snapshot this repository serves, pinned on first use so a request never mixes two versions."""
+        if self._snapshot is None:
+            self._snapshot = self._get_holder().current(self._get_csv_version())
+        return self._snapshot
+
     def get_books_list(self) -> list[Book]:
         """Get books data as a list of Book models."""
-        df = self._get_books_dataframe()
-        books = []
-        
-        for _, row in df.iterrows():
-            books.append(self._to_model(row))
-        
-        return books
+        return self._get_snapshot().books
+
+    def get_catalog_version(self) -> str:
+        """Get an identifier that changes whenever the catalog data changes."""
+        return self._get_snapshot().version
+
+    def get_prefix_index(self) -> PrefixIndex:
+        """Get the autocomplete prefix index for the current catalog."""
+        return self._get_prefix_index(self._get_snapshot())
+
+    def get_catalog_columns(self) -> CatalogColumns:
+        """Get the columnar view of the current catalog."""
+        return self._get_catalog_columns(self._get_snapshot())
+
+    def get_query_engine(self) -> BookQueryEngine:
+        """Get the multi-filter query engine for the current catalog."""
+        return self._get_query_engine(self._get_snapshot())
+
+    def get_sort_index(self) -> SortIndex:
+        """Get the precomputed sort orderings for the current catalog."""
+        return self._get_sort_index(self._get_snapshot())
+
+    def _get_prefix_index(self, snapshot: CatalogSnapshot) -> PrefixIndex:
+        return snapshot.get_index('prefix', PrefixIndex)
+
+    def _get_catalog_columns(self, snapshot: CatalogSnapshot) -> CatalogColumns:
+        return snapshot.get_index('columns', CatalogColumns)
+
+    def _get_query_engine(self, snapshot: CatalogSnapshot) -> BookQueryEngine:
+        return snapshot.get_index('query_engine', lambda books: BookQueryEngine(
+            books,
+            self._get_catalog_columns(snapshot),
+            snapshot.get_index('trigrams', TrigramIndex),
+            self._get_sort_index(snapshot)
+        ))
+
+    def _get_sort_index(self, snapshot: CatalogSnapshot) -> SortIndex:
+        return snapshot.get_index('sort', lambda books: SortIndex(books, self._get_catalog_columns(snapshot)))
@@ -0,0 +1,52 @@
+import threading
+from typing import Callable, Optional
+
+from api.infra.repositories.catalog_snapshot import CatalogSnapshot
+from api.utils.logger import logger
+
+
+class CatalogHolder:
+    """Serves the current catalog snapshot while the next version is built in the background, then swaps them atomically."""
+
+    def __init__(self, load: Callable[[str], CatalogSnapshot]):
+        self._load = load
+        self._current: Optional[CatalogSnapshot] = None
+        self._building: Optional[str] = None
+        self._failed: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def current(self, version: str) -> CatalogSnapshot:
+        """Return the snapshot being served, scheduling a rebuild when the data is at a newer version."""
+        snapshot = self._current
+        if snapshot is None:
+            # Nothing to serve yet, so the very first load has to happen on the request path
+            with self._lock:
+                if self._current is None:
+                    self._current = self._load(version)
+                return self._current
+        if snapshot.version != version:
+            self._schedule(version)
+        return snapshot
+
+    def _schedule(self, version: str):
+        with self._lock:
+            if self._building is not None or version == self._failed:
+                return
+            self._building = version
+        threading.Thread(target=self._build, args=(version,), name=f'catalog-{version}', daemon=True).start()
+
+    def _build(self, version: str):
+        try:
+            snapshot = self._load(version)
+        except Exception as error:
+            # The previous version keeps serving; this one is not retried until the data changes again
+            logger.error(f'Erro ao carregar a versão {version} do catálogo: {error}')
+            with self._lock:
+                self._failed = version
+                self._building = None
+            return
+
+        with self._lock:
+            # Requests that already pinned the old snapshot keep it; it is freed once the last of them finishes
+            self._current = snapshot
+            self._building = None
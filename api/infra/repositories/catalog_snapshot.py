@@ -0,0 +1,25 @@
+import threading
+from typing import Any, Callable, Dict, List
+
+from api.domain.models.book import Book
+
+
+class CatalogSnapshot:
+    """Books loaded from one version of the CSV plus the indexes lazily built over them."""
+
+    def __init__(self, version: str, books: List[Book]):
+        self.version = version
+        self.books = books
+        self._indexes: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def get_index(self, name: str, builder: Callable[[List[Book]], Any]) -> Any:
+        """Return the named index, building it once on first use. Builders may request other indexes."""
+        index = self._indexes.get(name)
+        if index is None:
+            with self._lock:
+                index = self._indexes.get(name)
+                if index is None:
+                    index = builder(self.books)
+                    self._indexes[name] = index
+        return index
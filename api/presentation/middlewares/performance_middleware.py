@@ -4,6 +4,19 @@ from datetime import datetime
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from api.utils.logger import logger
+from api.utils.shared_metrics import shared_metrics
+
+
+def _endpoint(request: Request) -> str:
+    """Path with its path parameters put back as placeholders (/books/{book_id}), so metrics don't get a key per URL."""
+    segments = request.url.path.split("/")
+    for name, value in request.path_params.items():
+        # Searched from the end, where parameters usually sit, in case a value also appears as a literal segment
+        for position in range(len(segments) - 1, -1, -1):
+            if segments[position] == str(value):
+                segments[position] = f"{{{name}}}"
+                break
+    return "/".join(segments)
 
 
 class PerformanceMiddleware(BaseHTTPMiddleware):
@@ -31,6 +44,7 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
             
             # Log the request/response
             logger.log_request_json(log_data)
+            shared_metrics.record_request(request.method, _endpoint(request), response.status_code, duration_ms, log_data["timestamp"])
             
             # Add performance headers
             response.headers["X-Response-Time"] = f"{duration_ms}ms"
@@ -54,6 +68,7 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
             
             # Log the error
             logger.log_error_json(error_data)
+            shared_metrics.record_error(request.method, _endpoint(request), error_data["error_type"])
             
             # Re-raise the exception
             raise 
\ No newline at end of file
@@ -1,83 +1,56 @@
-from typing import Dict, List, Any
-from fastapi import APIRouter, HTTPException
-from datetime import datetime, timedelta
-import json
-import os
-from collections import defaultdict, Counter
+from typing import Literal, Optional
+from fastapi import APIRouter, HTTPException, Query
+from datetime import datetime
+from collections import defaultdict
 from api.presentation.routes.router import DefaultRouter
 from api.utils.logger import logger
+from api.utils.metrics import group_counts, latency_quantiles, timeseries, top_counts
+from api.utils.shared_metrics import shared_metrics
 
 router = APIRouter(route_class=DefaultRouter)
 
+WINDOW_DESCRIPTION = "Restrict the figures to the last minute, 5 minutes or hour and add a per-bucket time series"
+
 @router.get("/metrics", summary="Get API metrics and usage statistics")
-async def get_api_metrics():
+def get_api_metrics(window: Optional[Literal["1m", "5m", "1h"]] = Query(None, description=WINDOW_DESCRIPTION)):
     """
     Get API performance metrics and usage statistics.
     """
+    # A plain def runs in the threadpool, so the Redis round trips of a shared snapshot never block the event loop
     try:
-        # Get logs from memory instead of reading files
-        api_calls = logger.get_api_calls()
-        errors = logger.get_errors()
-        
-        metrics = {
-            "total_requests": 0,
-            "requests_by_endpoint": {},
-            "requests_by_method": {},
-            "average_response_time": 0.0,
-            "error_rate": 0.0,
-            "top_endpoints": [],
-            "recent_activity": []
-        }
+        # Read the aggregates kept up to date by PerformanceMiddleware instead of replaying the logs
+        snapshot = shared_metrics.snapshot(window)
+        requests = snapshot["requests"]
+        total_requests = sum(requests.values())
+        error_count = sum(snapshot["errors"].values())
         
-        # Calculate metrics
-        if api_calls:
-            metrics["total_requests"] = len(api_calls)
-            
-            # Endpoint breakdown
-            endpoint_counts = Counter(call["path"] for call in api_calls)
-            metrics["requests_by_endpoint"] = dict(endpoint_counts)
-            
-            # Method breakdown
-            method_counts = Counter(call["method"] for call in api_calls)
-            metrics["requests_by_method"] = dict(method_counts)
-            
-            # Average response time
-            response_times = [call["duration_ms"] for call in api_calls if "duration_ms" in call]
-            if response_times:
-                metrics["average_response_time"] = sum(response_times) / len(response_times)
-            
-            # Error rate
-            total_requests = len(api_calls) + len(errors)
-            if total_requests > 0:
-                metrics["error_rate"] = len(errors) / total_requests * 100
-            
-            # Top endpoints
-            metrics["top_endpoints"] = [
+        result = {
+            "total_requests": total_requests,
+            "requests_by_endpoint": group_counts(requests, 1),
+            "requests_by_method": group_counts(requests, 0),
+            "requests_by_status": group_counts(requests, 2),
+            "average_response_time": snapshot["overall"].mean(),
+            "error_rate": error_count / (total_requests + error_count) * 100 if total_requests + error_count > 0 else 0.0,
+            "top_endpoints": [
                 {"endpoint": endpoint, "count": count}
-                for endpoint, count in endpoint_counts.most_common(5)
-            ]
-            
+                for endpoint, count in top_counts(requests, 1, 5)
+            ],
             # Recent activity (last 10 requests)
-            recent_calls = sorted(api_calls, key=lambda x: x.get("timestamp", ""), reverse=True)[:10]
-            metrics["recent_activity"] = [
-                {
-                    "timestamp": call.get("timestamp", ""),
-                    "method": call["method"],
-                    "path": call["path"],
-                    "status_code": call["status_code"],
-                    "duration_ms": call["duration_ms"]
-                }
-                for call in recent_calls
-            ]
+            "recent_activity": snapshot["recent"][::-1],
+            "workers": snapshot["workers"]
+        }
+        if window:
+            result["window"] = window
+            result["timeseries"] = timeseries(snapshot["buckets"])
         
-        return metrics
+        return result
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating metrics: {str(e)}")
 
 
 @router.get("/ml-predictions", summary="Get ML prediction statistics")
-async def get_ml_predictions():
+def get_ml_predictions():
     """
     Get ML prediction statistics and recent predictions.
     """
@@ -134,14 +107,14 @@ async def get_ml_predictions():
 
 
 @router.get("/performance", summary="Get detailed performance metrics")
-async def get_performance_metrics():
+def get_performance_metrics(window: Optional[Literal["1m", "5m", "1h"]] = Query(None, description=WINDOW_DESCRIPTION)):
     """
     Get detailed performance metrics.
     """
     try:
-        # Get logs from memory
-        api_calls = logger.get_api_calls()
-        errors = logger.get_errors()
+        snapshot = shared_metrics.snapshot(window)
+        overall = snapshot["overall"]
+        error_count = sum(snapshot["errors"].values())
         
         performance = {
             "response_time_distribution": {},
@@ -150,47 +123,44 @@ async def get_performance_metrics():
             "system_health": {}
         }
         
-        if api_calls:
+        if overall.count:
             # Response time distribution
-            response_times = [call["duration_ms"] for call in api_calls if "duration_ms" in call]
-            if response_times:
-                sorted_times = sorted(response_times)
-                performance["response_time_distribution"] = {
-                    "min": min(response_times),
-                    "max": max(response_times),
-                    "median": sorted_times[len(sorted_times)//2],
-                    "p95": sorted_times[int(len(sorted_times)*0.95)] if len(sorted_times) > 20 else max(response_times),
-                    "p99": sorted_times[int(len(sorted_times)*0.99)] if len(sorted_times) > 100 else max(response_times)
-                }
+            quantiles = latency_quantiles(overall)
+            performance["response_time_distribution"] = {
+                "min": overall.min,
+                "max": overall.max,
+                "median": quantiles["p50"],
+                **quantiles,
+                "relative_accuracy": overall.relative_accuracy
+            }
             
             # Endpoint performance
-            endpoint_perf = defaultdict(list)
-            for call in api_calls:
-                if "path" in call and "duration_ms" in call:
-                    endpoint_perf[call["path"]].append(call["duration_ms"])
-            
             performance["endpoint_performance"] = {
                 endpoint: {
-                    "avg_response_time": sum(times) / len(times),
-                    "request_count": len(times),
-                    "min_response_time": min(times),
-                    "max_response_time": max(times)
+                    "avg_response_time": sketch.mean(),
+                    "request_count": sketch.count,
+                    "min_response_time": sketch.min,
+                    "max_response_time": sketch.max,
+                    **latency_quantiles(sketch)
                 }
-                for endpoint, times in endpoint_perf.items()
+                for endpoint, sketch in snapshot["latency"].items()
             }
             
             # Error breakdown
-            error_types = Counter(error.get("error_type", "Unknown") for error in errors)
-            performance["error_breakdown"] = dict(error_types)
+            performance["error_breakdown"] = group_counts(snapshot["errors"], 2)
             
             # System health
-            total_requests = len(api_calls) + len(errors)
+            total_requests = overall.count + error_count
             performance["system_health"] = {
-                "uptime_percentage": 100 - (len(errors) / total_requests * 100) if total_requests > 0 else 100,
+                "uptime_percentage": 100 - (error_count / total_requests * 100),
                 "total_requests": total_requests,
-                "error_count": len(errors),
-                "success_rate": len(api_calls) / total_requests * 100 if total_requests > 0 else 100
+                "error_count": error_count,
+                "success_rate": overall.count / total_requests * 100
             }
+        performance["workers"] = snapshot["workers"]
+        if window:
+            performance["window"] = window
+            performance["timeseries"] = timeseries(snapshot["buckets"])
         
         return performance
         
@@ -199,29 +169,43 @@ async def get_performance_metrics():
 
 
 @router.get("/logs", summary="Get raw logs")
-async def get_logs(level: str | None = None, limit: int = 100):
+def get_logs(level: str | None = None, limit: int = 100, since: datetime | None = None, until: datetime | None = None):
     """
-    Get raw logs from memory.
+    Get raw logs, newest first, optionally restricted to a time range.
     """
     try:
-        logs = logger.get_logs(level=level, limit=limit)
+        logs = logger.get_logs(level=level, limit=limit, since=since, until=until)
         return {
             "logs": logs,
             "total_count": len(logs),
             "level_filter": level,
-            "limit": limit
+            "limit": limit,
+            "since": since,
+            "until": until
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving logs: {str(e)}")
 
 
+@router.get("/logs/queue", summary="Get log writer queue statistics")
+async def get_log_queue_stats():
+    """
+    Get the depth of the log write queue and its written/dropped counters.
+    """
+    try:
+        return logger.get_queue_stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving log queue stats: {str(e)}")
+
+
 @router.delete("/logs", summary="Clear all logs")
-async def clear_logs():
+def clear_logs():
     """
     Clear all stored logs.
     """
     try:
         logger.clear_logs()
+        shared_metrics.reset()
         return {"message": "All logs cleared successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error clearing logs: {str(e)}") 
\ No newline at end of file
@@ -1,14 +1,20 @@
-from typing import List
+import math
+from typing import List, Literal, Union
 
 from fastapi import APIRouter, HTTPException, Query, Depends
 
-from api.domain.models.book import Book
+from api.domain.indexes.catalog_columns import DEFAULT_PRICE_EDGES, MAX_PRICE_EDGES
+from api.domain.indexes.prefix_index import MAX_SUGGESTIONS
+from api.domain.models.book import AutocompleteSuggestion, Book, BookQuery, BookQueryResponse, FacetedBookListResponse
 from api.domain.repositories.book_repository import BookRepository
+from api.domain.usecases.books.autocomplete_books import AutocompleteBooksUseCase
 from api.domain.usecases.books.get_all_books import GetAllBooksUseCase
 from api.domain.usecases.books.get_by_id_books import GetBookByIdUseCase
 from api.domain.usecases.books.get_by_price_books import GetByPriceUseCase
 from api.domain.usecases.books.search_by_title_or_category import SearchByTitleOrCategoryUseCase
+from api.domain.usecases.books.search_with_facets import SearchBooksWithFacetsUseCase
 from api.domain.usecases.books.get_top_rated_books import GetTopRatedBooksUseCase
+from api.domain.usecases.books.query_books import QueryBooksUseCase
 from api.presentation.routes.router import DefaultRouter
 from api.presentation.factories.repository_factory import build_book_repository
 
@@ -16,10 +22,16 @@ router = APIRouter(route_class=DefaultRouter)
 
 
 @router.get("/", summary="Lista todos os livros", response_model=List[Book])
-def list_books(repository: BookRepository = Depends(build_book_repository)):
+def list_books(
+    sort: Literal["price", "rating", "title"] = Query(None, description="Campo de ordenação"),
+    order: Literal["asc", "desc"] = Query("asc", description="Direção da ordenação"),
+    offset: int = Query(0, ge=0, description="Número de livros a pular"),
+    limit: int = Query(None, ge=1, description="Número máximo de livros a retornar"),
+    repository: BookRepository = Depends(build_book_repository)
+):
     """Lista todos os livros disponíveis."""
     use_case = GetAllBooksUseCase(repository)
-    return use_case.execute()
+    return use_case.execute(sort, order, offset, limit)
 
 
 @router.get("/top-rated", summary="Lista livros mais bem avaliados", response_model=List[Book])
@@ -32,10 +44,20 @@ def list_top_rated_books(
     return use_case.execute(limit)
 
 
-@router.get("/search", summary="Busca livros por título ou categoria", response_model=List[Book])
+@router.get(
+    "/search",
+    summary="Busca livros por título ou categoria",
+    response_model=Union[List[Book], FacetedBookListResponse]
+)
 def search_books(
     title: str = Query(None, description="Título do livro para busca"),
     category: str = Query(None, description="Categoria do livro para busca"),
+    facets: bool = Query(False, description="Inclui contagens por categoria, avaliação e faixa de preço"),
+    price_buckets: str = Query(None, description="Limites das faixas de preço separados por vírgula, ex: 20,30,40"),
+    sort: Literal["price", "rating", "title"] = Query(None, description="Campo de ordenação"),
+    order: Literal["asc", "desc"] = Query("asc", description="Direção da ordenação"),
+    offset: int = Query(0, ge=0, description="Número de livros a pular"),
+    limit: int = Query(None, ge=1, description="Número máximo de livros a retornar"),
     repository: BookRepository = Depends(build_book_repository)
 ):
     """Busca livros por título ou categoria."""
@@ -45,8 +67,71 @@ def search_books(
             detail="Pelo menos um parâmetro de busca (title ou category) deve ser fornecido"
         )
     
+    if facets:
+        price_edges = _parse_price_buckets(price_buckets) if price_buckets else DEFAULT_PRICE_EDGES
+        return SearchBooksWithFacetsUseCase(repository).execute(title, category, price_edges, sort, order, offset, limit)
+
     use_case = SearchByTitleOrCategoryUseCase(repository)
-    return use_case.execute(title, category)
+    return use_case.execute(title, category, sort, order, offset, limit)
+
+
+def _parse_price_buckets(price_buckets: str) -> list[float]:
+    """Parse comma separated price bucket edges: finite, positive, strictly increasing and at most MAX_PRICE_EDGES of them."""
+    try:
+        edges = [float(edge) for edge in price_buckets.split(",") if edge.strip()]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="price_buckets deve conter números separados por vírgula") from e
+    if not all(math.isfinite(edge) for edge in edges):
+        raise HTTPException(status_code=400, detail="price_buckets deve conter apenas números finitos")
+    if any(edge <= 0 for edge in edges):
+        raise HTTPException(status_code=400, detail="price_buckets deve conter apenas valores positivos")
+    if any(low >= high for low, high in zip(edges, edges[1:])):
+        raise HTTPException(status_code=400, detail="price_buckets deve estar em ordem estritamente crescente")
+    if len(edges) > MAX_PRICE_EDGES:
+        raise HTTPException(status_code=400, detail=f"price_buckets aceita no máximo {MAX_PRICE_EDGES} limites")
+    return edges
+
+
+@router.get("/autocomplete", summary="Sugere livros e categorias enquanto o usuário digita", response_model=List[AutocompleteSuggestion])
+def autocomplete_books(
+    prefix: str = Query(..., min_length=1, description="Texto digitado até o momento"),
+    limit: int = Query(10, ge=1, le=MAX_SUGGESTIONS, description="Número máximo de sugestões"),
+    repository: BookRepository = Depends(build_book_repository)
+):
+    """Sugere títulos e categorias que começam com o prefixo, ordenados pela avaliação."""
+    use_case = AutocompleteBooksUseCase(repository)
+    return use_case.execute(prefix, limit)
+
+
+@router.get("/query", summary="Consulta livros combinando filtros, ordenação e limite", response_model=BookQueryResponse)
+def query_books(
+    title: str = Query(None, description="Trecho do título"),
+    category: str = Query(None, description="Trecho da categoria"),
+    min_price: float = Query(None, description="Preço mínimo"),
+    max_price: float = Query(None, description="Preço máximo"),
+    min_rating: float = Query(None, ge=0, le=5, description="Avaliação mínima"),
+    available: bool = Query(None, description="Somente livros em estoque (true) ou esgotados (false)"),
+    sort: Literal["price", "rating", "title"] = Query(None, description="Campo de ordenação"),
+    order: Literal["asc", "desc"] = Query("asc", description="Direção da ordenação"),
+    offset: int = Query(0, ge=0, description="Número de livros a pular"),
+    limit: int = Query(None, ge=1, description="Número máximo de livros a retornar"),
+    repository: BookRepository = Depends(build_book_repository)
+):
+    """Consulta livros combinando filtros de título, categoria, preço, avaliação e disponibilidade."""
+    query = BookQuery(
+        title=title,
+        category=category,
+        min_price=min_price,
+        max_price=max_price,
+        min_rating=min_rating,
+        available=available,
+        sort=sort,
+        order=order,
+        offset=offset,
+        limit=limit
+    )
+    use_case = QueryBooksUseCase(repository)
+    return use_case.execute(query)
 
 
 @router.get("/price-range", summary="Filtra livros por faixa de preço", response_model=List[Book])
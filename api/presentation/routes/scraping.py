@@ -1,14 +1,26 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 
+from api.domain.models.scraping import ScrapeJob
 from api.presentation.authorization.auth import get_current_user
+from api.utils.scrape_jobs import scrape_jobs
 from scripts.scrape_books import scrape
 from api.presentation.routes.router import DefaultRouter
 
 
 router = APIRouter(route_class=DefaultRouter)
 
-@router.post("/trigger")
+@router.post("/trigger", response_model=ScrapeJob, status_code=202)
 async def trigger_scraping(_user=Depends(get_current_user)):
-    """Dispara o processo de scraping de livros."""
-    result = scrape()
-    return {"message": "Scraping iniciado", "result": result}
\ No newline at end of file
+    """Dispara o scraping de livros em segundo plano e retorna o job criado."""
+    job, started = scrape_jobs.start(scrape)
+    if not started:
+        raise HTTPException(status_code=409, detail=f"Já existe um scraping em andamento (job {job.id})")
+    return job
+
+@router.get("/jobs/{job_id}", response_model=ScrapeJob)
+async def get_scraping_job(job_id: str, _user=Depends(get_current_user)):
+    """Retorna o status e o progresso de um job de scraping."""
+    job = scrape_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job de scraping não encontrado")
+    return job
@@ -1,10 +1,13 @@
+import math
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 
-from api.domain.models.stats import CategoryStats, StatsOverview
+from api.domain.indexes.catalog_columns import DEFAULT_PERCENTILES, MAX_PERCENTILES
+from api.domain.models.stats import CategoryStats, StatsDistribution, StatsOverview
 from api.domain.repositories.book_repository import BookRepository
 from api.domain.usecases.stats.get_categories_stats import GetCategoriesStatsUseCase
+from api.domain.usecases.stats.get_distribution_stats import GetDistributionStatsUseCase
 from api.domain.usecases.stats.get_overview_stats import GetStatsOverviewUseCase
 from api.presentation.routes.router import DefaultRouter
 from api.presentation.factories.repository_factory import build_book_repository
@@ -28,3 +31,25 @@ def get_categories(repository: BookRepository = Depends(build_book_repository)):
     """Retorna estatísticas agrupadas por categoria."""
     use_case = GetCategoriesStatsUseCase(repository)
     return use_case.execute()
+
+
+@router.get("/distribution",
+          summary="Distribuição de preços e avaliações",
+          response_model=StatsDistribution)
+def get_distribution(
+    bins: int = Query(10, ge=1, le=100, description="Número de faixas do histograma de preços"),
+    percentiles: str = Query(None, description="Percentis de preço separados por vírgula, ex: 5,50,95"),
+    repository: BookRepository = Depends(build_book_repository)
+):
+    """Retorna percentis e histograma de preços e contagem de avaliações, no geral e por categoria."""
+    try:
+        values = [float(value) for value in percentiles.split(",") if value.strip()] if percentiles else DEFAULT_PERCENTILES
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="percentiles deve conter números separados por vírgula") from e
+    if not values or any(not math.isfinite(value) or value < 0 or value > 100 for value in values):
+        raise HTTPException(status_code=400, detail="percentiles deve conter valores entre 0 e 100")
+    if len(values) > MAX_PERCENTILES:
+        raise HTTPException(status_code=400, detail=f"percentiles aceita no máximo {MAX_PERCENTILES} valores")
+
+    use_case = GetDistributionStatsUseCase(repository)
+    return use_case.execute(bins, values)
@@ -0,0 +1,135 @@
+import json
+import os
+import re
+import threading
+from typing import Callable, Dict, List, Optional
+
+BLOCK_SIZE = 64 * 1024
+# Bytes from the start of the file kept to recognise it: a file truncated and written again past its old size has the
+# same inode and a larger size, but starts with different records
+HEAD_SIZE = 256
+
+# Logger writes json.dumps of a dict that starts with timestamp and level, so both can be read without parsing the line
+_LINE_HEADER = re.compile(rb'^\{"timestamp": "([^"]*)", "level": "([^"]*)"')
+
+
+class _Block:
+    __slots__ = ('start', 'end', 'min_timestamp', 'max_timestamp', 'levels')
+
+    def __init__(self, start: int):
+        self.start = start
+        self.end = start
+        self.min_timestamp: Optional[str] = None
+        self.max_timestamp: Optional[str] = None
+        self.levels: set = set()
+
+    def add(self, length: int, timestamp: Optional[str], level: Optional[str]):
+        self.end += length
+        if timestamp:
+            self.min_timestamp = timestamp if self.min_timestamp is None else min(self.min_timestamp, timestamp)
+            self.max_timestamp = timestamp if self.max_timestamp is None else max(self.max_timestamp, timestamp)
+        if level:
+            self.levels.add(level)
+
+
+def _line_header(line: bytes):
+    match = _LINE_HEADER.match(line)
+    if match is not None:
+        return match.group(1).decode(), match.group(2).decode()
+    try:
+        log = json.loads(line)
+        return log.get('timestamp'), log.get('level')
+    except (ValueError, AttributeError):
+        return None, None
+
+
+class LogFileReader:
+    """Newest-first reader for a JSON-lines log file.
+
+    The file is split into blocks of about `block_size` bytes, each indexed with its time range and the levels it holds.
+    The index grows incrementally with the file, so a query only reads the blocks that can match, starting from the
+    end, and stops parsing as soon as it has `limit` entries.
+    """
+
+    def __init__(self, path: str, block_size: int = BLOCK_SIZE):
+        self.path = path
+        self.block_size = block_size
+        self.blocks: List[_Block] = []
+        self._indexed = 0
+        self._inode: Optional[int] = None
+        self._mtime: Optional[int] = None
+        self._head = b''
+        self._lock = threading.Lock()
+
+    def reset(self):
+        self.blocks, self._indexed, self._inode, self._mtime, self._head = [], 0, None, None, b''
+
+    def _refresh(self):
+        """Index the complete lines appended since the last call; start over if the file was truncated or replaced."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self.reset()
+            return
+        if (stat.st_ino, stat.st_size, stat.st_mtime_ns) == (self._inode, self._indexed, self._mtime):
+            return
+
+        with open(self.path, 'rb') as f:
+            head = f.read(HEAD_SIZE)
+            if stat.st_ino != self._inode or stat.st_size < self._indexed or not head.startswith(self._head):
+                self.reset()
+            self._inode, self._mtime, self._head = stat.st_ino, stat.st_mtime_ns, head
+
+            # The last block keeps filling up until it reaches block_size, so small appends don't fragment the index
+            block = self.blocks[-1] if self.blocks and self.blocks[-1].end - self.blocks[-1].start < self.block_size else None
+            f.seek(self._indexed)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # A line still being written is indexed once it is complete
+                    break
+                if block is None or block.end - block.start >= self.block_size:
+                    block = _Block(self._indexed)
+                    self.blocks.append(block)
+                timestamp, level = _line_header(line)
+                block.add(len(line), timestamp, level)
+                self._indexed += len(line)
+
+    def read(self, level: Optional[str] = None, limit: Optional[int] = None, since: Optional[str] = None,
+             until: Optional[str] = None, match: Optional[Callable[[Dict], bool]] = None) -> List[Dict]:
+        """Entries newest first, filtered by level, timestamp range (same format as the file) and `match`."""
+        with self._lock:
+            self._refresh()
+            blocks = list(self.blocks)
+
+        logs = []
+        if not blocks:
+            return logs
+        with open(self.path, 'rb') as f:
+            for block in reversed(blocks):
+                if level is not None and level not in block.levels:
+                    continue
+                if since is not None and block.max_timestamp is not None and block.max_timestamp < since:
+                    continue
+                if until is not None and block.min_timestamp is not None and block.min_timestamp > until:
+                    continue
+
+                f.seek(block.start)
+                for line in reversed(f.read(block.end - block.start).splitlines()):
+                    timestamp, line_level = _line_header(line)
+                    # The header alone decides most filters, so non-matching lines are never fully parsed
+                    if level is not None and line_level != level:
+                        continue
+                    if since is not None and (timestamp or '') < since:
+                        continue
+                    if until is not None and (timestamp or '') > until:
+                        continue
+                    try:
+                        log = json.loads(line)
+                    except ValueError:
+                        continue
+                    if match is not None and not match(log):
+                        continue
+                    logs.append(log)
+                    if limit is not None and len(logs) >= limit:
+                        return logs
+        return logs
@@ -1,27 +1,92 @@
+import atexit
 import datetime
 import os
 import json
+import queue
 import threading
-from typing import Dict, List, Any, Optional
+import time
+import uuid
+from typing import Callable, Dict, List, Any, Optional
 from collections import deque
 import redis
+
+from api.utils.log_reader import LogFileReader
+from api.utils.redis_pool import get_redis_pool
+
+# What to do with a record when the write queue is full
+OVERFLOW_POLICIES = ('drop', 'block')
+
+# 'stream' appends to one capped Redis stream; 'keys' is the older layout of one key per log plus a sorted set
+REDIS_BACKENDS = ('stream', 'keys')
+
+REDIS_LOG_TTL = 7 * 24 * 60 * 60  # 7 days in seconds
+REDIS_TIMELINE_KEY = 'logs:timeline'
+REDIS_STREAM_KEY = 'logs:stream'
+REDIS_STREAM_FIELD = 'log'
+
+# Longest a file read waits for queued records to reach the file
+FILE_READ_FLUSH_TIMEOUT = 0.5
+
+
 class Logger:
     """Unified logger for serverless environments with Redis, file, and memory storage."""
     
-    def __init__(self, max_logs: int = 1000):
+    def __init__(self, max_logs: int = 1000, max_queue: int = 10000, overflow: str = 'drop',
+                 block_timeout: float = 0.05, batch_size: int = 200, redis_batch_size: int = 100,
+                 redis_flush_interval: float = 1.0, redis_timeline_max: int = 100000, redis_max_connections: int = 10,
+                 redis_backend: str = 'stream', redis_stream_maxlen: int = 100000, redis_read_batch: int = 500,
+                 redis_client: Optional['redis.Redis'] = None):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}")
+        if redis_backend not in REDIS_BACKENDS:
+            raise ValueError(f"redis_backend must be one of {REDIS_BACKENDS}, got {redis_backend!r}")
         self.max_logs = max_logs
         self.logs = deque(maxlen=max_logs)
         self.lock = threading.Lock()
         
+        # Console, file and Redis writes happen on a background thread fed through a bounded queue
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.batch_size = batch_size
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._idle = threading.Condition()
+        self._pending = 0
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        
+        # Redis writes are buffered and sent in one pipeline once the batch is full or old enough
+        self.redis_batch_size = redis_batch_size
+        self.redis_flush_interval = redis_flush_interval
+        self.redis_timeline_max = redis_timeline_max
+        self.redis_max_connections = redis_max_connections
+        self.redis_backend = redis_backend
+        self.redis_stream_maxlen = redis_stream_maxlen
+        self.redis_read_batch = redis_read_batch
+        self._redis_buffer: List[tuple] = []
+        self._redis_buffer_since = 0.0
+        
         # Check environment
         self.is_local = self._is_local_environment()
         
         # Initialize storage backends
         self.redis_client = None
+        self.redis_available = False
         self.file_logging_enabled = False
         
-        # Setup storage based on environment
-        self._setup_storage()
+        # Setup storage based on environment; a client passed in (such as a fake in tests) replaces REDIS_URL
+        if redis_client is not None:
+            self.redis_client = redis_client
+            self.redis_available = True
+        else:
+            self._setup_storage()
+        
+        # Records still queued at interpreter exit are written rather than lost
+        atexit.register(self.close)
     
     def _is_local_environment(self) -> bool:
         print(os.getenv('ENV'))
@@ -56,7 +121,7 @@ class Logger:
         try:
             redis_url = os.getenv('REDIS_URL')
             if redis_url and redis:
-                self.redis_client = redis.from_url(redis_url)
+                self.redis_client = redis.Redis(connection_pool=get_redis_pool(redis_url, self.redis_max_connections))
                 # Test connection
                 self.redis_client.ping()
                 self.redis_available = True
@@ -81,54 +146,170 @@ class Logger:
                 f.write('')
             
             self.log_file = log_file
+            self.log_reader = LogFileReader(log_file)
             self.file_logging_enabled = True
             print("✅ File logging enabled for local development")
         except Exception as e:
             print(f"❌ File logging setup failed: {e}")
             self.file_logging_enabled = False
     
-    def _store_in_redis(self, log_data: Dict[str, Any]) -> bool:
-        """Store log entry in Redis."""
+    def _store_in_redis(self, records: List[tuple]) -> bool:
+        """Store a batch of (created_at, log entry) records in Redis with a single pipelined round trip."""
         if not self.redis_available or not self.redis_client:
             return False
         
         try:
-            # Add timestamp if not present
-            if 'timestamp' not in log_data:
-                log_data['timestamp'] = datetime.datetime.now().isoformat()
-            
-            # Store in Redis with expiration (7 days)
-            log_key = f"log:{datetime.datetime.now().timestamp()}"
-            self.redis_client.setex(
-                log_key,
-                7 * 24 * 60 * 60,  # 7 days in seconds
-                json.dumps(log_data)
-            )
+            pipe = self.redis_client.pipeline(transaction=False)
+            if self.redis_backend == 'stream':
+                for created_at, log_data in records:
+                    if 'timestamp' not in log_data:
+                        log_data['timestamp'] = datetime.datetime.fromtimestamp(created_at).isoformat()
+                    # Entry ids are assigned by the server, so writes from several processes stay ordered
+                    pipe.xadd(REDIS_STREAM_KEY, {REDIS_STREAM_FIELD: json.dumps(log_data)},
+                              maxlen=self.redis_stream_maxlen, approximate=True)
+                pipe.execute()
+                return True
             
-            # Add to sorted set for easy retrieval
-            self.redis_client.zadd(
-                'logs:timeline',
-                {log_key: datetime.datetime.now().timestamp()}
-            )
+            timeline = {}
+            for created_at, log_data in records:
+                # Add timestamp if not present
+                if 'timestamp' not in log_data:
+                    log_data['timestamp'] = datetime.datetime.fromtimestamp(created_at).isoformat()
+                
+                # A random suffix keeps keys unique when several records share a timestamp
+                log_key = f"log:{created_at:.6f}:{uuid.uuid4().hex[:12]}"
+                pipe.set(log_key, json.dumps(log_data), ex=REDIS_LOG_TTL)
+                timeline[log_key] = created_at
             
+            # Keep the timeline no longer than the keys it points to live, and no longer than redis_timeline_max
+            pipe.zadd(REDIS_TIMELINE_KEY, timeline)
+            pipe.zremrangebyscore(REDIS_TIMELINE_KEY, '-inf', time.time() - REDIS_LOG_TTL)
+            pipe.zremrangebyrank(REDIS_TIMELINE_KEY, 0, -self.redis_timeline_max - 1)
+            pipe.execute()
             return True
         except Exception as e:
             print(f"Failed to store log in Redis: {e}")
             return False
     
-    def _store_in_file(self, log_data: Dict[str, Any]) -> bool:
-        """Store log entry in file."""
+    def _store_in_file(self, entries: List[Dict[str, Any]]) -> bool:
+        """Store a batch of log entries in file."""
         if not self.file_logging_enabled:
             return False
         
         try:
             with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(log_data) + '\n')
+                f.write(''.join(json.dumps(log_data) + '\n' for log_data in entries))
             return True
         except Exception as e:
             print(f"Failed to store log in file: {e}")
             return False
     
+    def _print_entries(self, entries: List[Dict[str, Any]]):
+        """Print a batch of log entries to the console in one write."""
+        lines = []
+        for log_entry in entries:
+            lines.append(f"[{log_entry['timestamp']}] [{log_entry['level']}] {log_entry['message']}")
+            if log_entry['data']:
+                lines.append(f"Data: {json.dumps(log_entry['data'], indent=2)}")
+        print('\n'.join(lines))
+    
+    def _write_entries(self, records: List[tuple]) -> int:
+        """Write a batch of (created_at, log entry) records; returns how many are fully written."""
+        entries = [log_entry for _, log_entry in records]
+        self._print_entries(entries)
+        
+        # Store in file for local development
+        if self.is_local:
+            self._store_in_file(entries)
+        
+        # Store in Redis when configured, once enough records have built up
+        if self.redis_available:
+            if not self._redis_buffer:
+                self._redis_buffer_since = time.monotonic()
+            self._redis_buffer.extend(records)
+            if len(self._redis_buffer) < self.redis_batch_size:
+                return 0
+            return self._flush_redis()
+        return len(records)
+    
+    def _flush_redis(self) -> int:
+        records, self._redis_buffer = self._redis_buffer, []
+        if records:
+            self._store_in_redis(records)
+        return len(records)
+    
+    def _next_timeout(self) -> Optional[float]:
+        """How long the writer may wait for new records before the buffered Redis batch is due."""
+        if not self._redis_buffer:
+            return None
+        return max(0.0, self._redis_buffer_since + self.redis_flush_interval - time.monotonic())
+    
+    def _ensure_writer(self):
+        if self._writer is not None and self._writer.is_alive():
+            return
+        with self._writer_lock:
+            # Started lazily, so a process forked after import gets a writer of its own
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._drain, name='log-writer', daemon=True)
+                self._writer.start()
+    
+    def _drain(self):
+        """Writer loop: take whatever has queued up, up to batch_size records, and write it in one go."""
+        while True:
+            try:
+                records = [self._queue.get(timeout=self._next_timeout())]
+            except queue.Empty:
+                # Nothing new arrived in time: send the Redis batch as it is
+                self._mark_written(self._flush_redis())
+                continue
+            while len(records) < self.batch_size:
+                try:
+                    records.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            stop = None in records
+            records = [record for record in records if record is not None]
+            done = len(records)
+            try:
+                done = self._write_entries(records) if records else 0
+                if stop:
+                    done += self._flush_redis()
+            except Exception as e:
+                print(f"Failed to write logs: {e}")
+                # Buffered records are given up on, so they don't keep flush() waiting
+                done = len(records) + len(self._redis_buffer)
+                self._redis_buffer = []
+            finally:
+                self._mark_written(done, batch=bool(records))
+            if stop:
+                return
+    
+    def _mark_written(self, count: int, batch: bool = False):
+        with self._idle:
+            self.written += count
+            self.batches += batch
+            self._pending -= count
+            self._idle.notify_all()
+    
+    def _enqueue(self, log_entry: Dict[str, Any]):
+        self._ensure_writer()
+        with self._idle:
+            self._pending += 1
+        try:
+            if self.overflow == 'block':
+                self._queue.put((time.time(), log_entry), timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait((time.time(), log_entry))
+        except queue.Full:
+            with self._idle:
+                self._pending -= 1
+                self.dropped += 1
+                self._idle.notify_all()
+            return
+        with self._idle:
+            self.enqueued += 1
+    
     def __log(self, level: str, message: str, data: Optional[Dict] = None):
         """Internal method to log messages."""
         timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -139,22 +320,41 @@ class Logger:
             'data': data
         }
         
-        # Print to console (always available)
-        print(f'[{timestamp}] [{level}] {message}')
-        if data:
-            print(f'Data: {json.dumps(data, indent=2)}')
-        
-        # Store in memory for all environments
+        # Store in memory for all environments; records dropped from the queue are still kept here
         with self.lock:
             self.logs.append(log_entry)
         
-        # Store in Redis for non-local environments
-        if not self.is_local:
-            self._store_in_redis(log_entry)
-        
-        # Store in file for local development
-        if self.is_local:
-            self._store_in_file(log_entry)
+        # Console, Redis and file writes are left to the background writer
+        self._enqueue(log_entry)
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued record has been written; returns False if the timeout expired first."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending <= 0, timeout)
+    
+    def close(self, timeout: float = 5.0):
+        """Write the queued records and stop the writer thread."""
+        if self._writer is None or not self._writer.is_alive():
+            return
+        # The sentinel waits its turn in the queue, so everything logged before it is written first
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._writer.join(timeout)
+    
+    def get_queue_stats(self) -> Dict[str, Any]:
+        """Get the write queue depth and the counters of queued, written and dropped records."""
+        with self._idle:
+            return {
+                'queue_depth': self._queue.qsize(),
+                'max_queue': self.max_queue,
+                'overflow_policy': self.overflow,
+                'enqueued': self.enqueued,
+                'written': self.written,
+                'dropped': self.dropped,
+                'batches': self.batches
+            }
     
     def debug(self, message: str, data: Optional[Dict] = None):
         """Log a debug message."""
@@ -217,103 +417,149 @@ class Logger:
         """Log an ML prediction in JSON format."""
         self.info(f"ML_PREDICTION: {json.dumps(prediction_data)}", prediction_data)
     
-    def get_logs(self, level: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
-        """Get stored logs, optionally filtered by level."""
-        logs = []
-        
-        # Get from memory
+    def _reads_from_stream(self) -> bool:
+        return self.redis_available and self.redis_backend == 'stream'
+    
+    def get_logs(self, level: Optional[str] = None, limit: Optional[int] = None,
+                 since: Optional[datetime.datetime] = None, until: Optional[datetime.datetime] = None) -> List[Dict]:
+        """Get stored logs, newest first, optionally filtered by level and time range."""
+        return self._query(level=level, limit=limit, since=since, until=until)
+    
+    def _query(self, level: Optional[str] = None, limit: Optional[int] = None,
+               since: Optional[datetime.datetime] = None, until: Optional[datetime.datetime] = None,
+               match: Optional[Callable[[Dict], bool]] = None) -> List[Dict]:
+        """Newest matching logs from the Redis stream, the log file or memory, whichever holds the full history."""
+        if self._reads_from_stream():
+            return self._get_stream_logs(level=level, limit=limit, since=since, until=until, match=match)
+        if self.file_logging_enabled:
+            return self._get_file_logs(level=level, limit=limit, since=since, until=until, match=match)
+        return self._get_memory_logs(level=level, limit=limit, since=since, until=until, match=match)
+    
+    def _get_memory_logs(self, level: Optional[str] = None, limit: Optional[int] = None,
+                         since: Optional[datetime.datetime] = None, until: Optional[datetime.datetime] = None,
+                         match: Optional[Callable[[Dict], bool]] = None) -> List[Dict]:
+        """Get logs from memory."""
         with self.lock:
             memory_logs = list(self.logs)
         
-        # Get from file if available
-        if self.file_logging_enabled:
-            try:
-                file_logs = self._get_file_logs()
-                logs.extend(file_logs)
-            except Exception as e:
-                print(f"Failed to get logs from file: {e}")
-        
-        # Add memory logs
-        logs.extend(memory_logs)
-        
-        # Remove duplicates and sort by timestamp
-        unique_logs = []
-        seen_timestamps = set()
-        for log in logs:
-            timestamp = log.get('timestamp', '')
-            if timestamp not in seen_timestamps:
-                unique_logs.append(log)
-                seen_timestamps.add(timestamp)
-        
-        # Sort by timestamp (newest first)
-        unique_logs.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-        
-        # Filter by level
-        if level:
-            unique_logs = [log for log in unique_logs if log.get('level') == level]
-        
-        # Apply limit
-        if limit:
-            unique_logs = unique_logs[:limit]
-        
-        return unique_logs
+        since_timestamp, until_timestamp = self._file_timestamp(since), self._file_timestamp(until)
+        logs = []
+        # Appended in the order they were logged, so newest first is simply the reverse
+        for log in reversed(memory_logs):
+            if level and log.get('level') != level:
+                continue
+            if since_timestamp and log.get('timestamp', '') < since_timestamp:
+                continue
+            if until_timestamp and log.get('timestamp', '') > until_timestamp:
+                continue
+            if match and not match(log):
+                continue
+            logs.append(log)
+            if limit is not None and len(logs) >= limit:
+                break
+        return logs
+    
+    @staticmethod
+    def _stream_id(moment: datetime.datetime) -> str:
+        # A bare millisecond time covers every entry id within that millisecond
+        return str(int(moment.timestamp() * 1000))
+    
+    def _get_stream_logs(self, level: Optional[str] = None, limit: Optional[int] = None,
+                         since: Optional[datetime.datetime] = None, until: Optional[datetime.datetime] = None,
+                         match: Optional[Callable[[Dict], bool]] = None) -> List[Dict]:
+        """Page backwards through the Redis stream with XREVRANGE until `limit` entries match."""
+        max_id = self._stream_id(until) if until else '+'
+        min_id = self._stream_id(since) if since else '-'
+        filtered = level is not None or match is not None
+        logs = []
+        try:
+            while limit is None or len(logs) < limit:
+                # Without filters every entry read is returned, so the server never sends more than the limit asks for
+                count = self.redis_read_batch if filtered or limit is None else min(self.redis_read_batch, limit - len(logs))
+                entries = self.redis_client.xrevrange(REDIS_STREAM_KEY, max=max_id, min=min_id, count=count)
+                for entry_id, fields in entries:
+                    payload = fields.get(REDIS_STREAM_FIELD.encode(), fields.get(REDIS_STREAM_FIELD))
+                    try:
+                        log = json.loads(payload)
+                    except (TypeError, json.JSONDecodeError):
+                        continue
+                    if level and log.get('level') != level:
+                        continue
+                    if match and not match(log):
+                        continue
+                    logs.append(log)
+                    if limit is not None and len(logs) >= limit:
+                        break
+                if len(entries) < count:
+                    break
+                # Exclusive cursor: the next page starts just before the oldest entry read so far
+                last_id = entries[-1][0]
+                max_id = f"({last_id.decode() if isinstance(last_id, bytes) else last_id}"
+        except Exception as e:
+            print(f"Failed to retrieve logs from Redis: {e}")
+        return logs
+    
+    @staticmethod
+    def _file_timestamp(moment: Optional[datetime.datetime]) -> Optional[str]:
+        # Same format as the timestamps written by __log, which sorts chronologically as a string
+        return moment.strftime('%Y-%m-%d %H:%M:%S') if moment else None
     
-    def _get_file_logs(self) -> List[Dict]:
-        """Get logs from file."""
+    def _get_log_reader(self) -> LogFileReader:
+        if self.log_reader.path != self.log_file:
+            self.log_reader = LogFileReader(self.log_file)
+        return self.log_reader
+    
+    def _get_file_logs(self, level: Optional[str] = None, limit: Optional[int] = None,
+                       since: Optional[datetime.datetime] = None, until: Optional[datetime.datetime] = None,
+                       match: Optional[Callable[[Dict], bool]] = None) -> List[Dict]:
+        """Get logs from file, reading backwards from the end through the block index."""
         if not self.file_logging_enabled:
             return []
         
+        # Records logged just before the read are still in the write queue
+        self.flush(timeout=FILE_READ_FLUSH_TIMEOUT)
         try:
-            logs = []
-            with open(self.log_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    try:
-                        log_entry = json.loads(line.strip())
-                        logs.append(log_entry)
-                    except json.JSONDecodeError:
-                        continue
-            
-            return logs
+            return self._get_log_reader().read(
+                level=level,
+                limit=limit,
+                since=self._file_timestamp(since),
+                until=self._file_timestamp(until),
+                match=match
+            )
         except Exception as e:
             print(f"Failed to retrieve logs from file: {e}")
             return []
     
+    @staticmethod
+    def _is_api_call(log: Dict) -> bool:
+        return bool(log.get('data')) and 'method' in log['data'] and 'path' in log['data']
+    
+    @staticmethod
+    def _is_api_error(log: Dict) -> bool:
+        return bool(log.get('data')) and 'error_type' in log['data']
+    
+    @staticmethod
+    def _is_ml_prediction(log: Dict) -> bool:
+        return bool(log.get('data')) and 'book_id' in log['data'] and 'prediction' in log['data']
+    
     def get_api_calls(self, limit: Optional[int] = None) -> List[Dict]:
         """Get API call logs."""
-        logs = self.get_logs(limit=limit)
-        api_calls = []
-        
-        for log in logs:
-            if log.get('data') and 'method' in log['data'] and 'path' in log['data']:
-                api_calls.append(log['data'])
-        
-        return api_calls
+        return [log['data'] for log in self._query(limit=limit, match=self._is_api_call)]
     
     def get_errors(self, limit: Optional[int] = None) -> List[Dict]:
         """Get error logs."""
-        logs = self.get_logs(level='ERROR', limit=limit)
-        errors = []
-        
-        for log in logs:
-            if log.get('data') and 'error_type' in log['data']:
-                errors.append(log['data'])
-        
-        return errors
+        return [log['data'] for log in self._query(level='ERROR', limit=limit, match=self._is_api_error)]
     
     def get_ml_predictions(self, limit: Optional[int] = None) -> List[Dict]:
         """Get ML prediction logs."""
-        logs = self.get_logs(limit=limit)
-        predictions = []
-        
-        for log in logs:
-            if log.get('data') and 'book_id' in log['data'] and 'prediction' in log['data']:
-                predictions.append(log['data'])
-        
-        return predictions
+        return [log['data'] for log in self._query(limit=limit, match=self._is_ml_prediction)]
     
     def clear_logs(self) -> bool:
         """Clear all stored logs."""
         try:
+            # Let queued records land first, so they can't reappear in the file after it's cleared
+            self.flush(timeout=5.0)
+            
             # Clear memory logs
             with self.lock:
                 self.logs.clear()
@@ -323,9 +569,18 @@ class Logger:
                 try:
                     with open(self.log_file, 'w') as f:
                         f.write('')
+                    # The truncated file keeps its inode, so the old block index must not be reused
+                    self.log_reader = LogFileReader(self.log_file)
                 except Exception as e:
                     print(f"Failed to clear file logs: {e}")
             
+            # Clear Redis logs
+            if self.redis_available:
+                try:
+                    self.redis_client.delete(REDIS_STREAM_KEY, REDIS_TIMELINE_KEY)
+                except Exception as e:
+                    print(f"Failed to clear Redis logs: {e}")
+            
             return True
         except Exception as e:
             print(f"Failed to clear logs: {e}")
@@ -333,4 +588,14 @@ class Logger:
 
 
 # Global logger instance
-logger = Logger() 
\ No newline at end of file
+logger = Logger(
+    max_queue=int(os.getenv('LOG_QUEUE_SIZE', 10000)),
+    overflow=os.getenv('LOG_QUEUE_OVERFLOW', 'drop'),
+    batch_size=int(os.getenv('LOG_BATCH_SIZE', 200)),
+    redis_batch_size=int(os.getenv('LOG_REDIS_BATCH_SIZE', 100)),
+    redis_flush_interval=float(os.getenv('LOG_REDIS_FLUSH_INTERVAL', 1.0)),
+    redis_timeline_max=int(os.getenv('LOG_REDIS_TIMELINE_MAX', 100000)),
+    redis_max_connections=int(os.getenv('REDIS_MAX_CONNECTIONS', 10)),
+    redis_backend=os.getenv('LOG_REDIS_BACKEND', 'stream'),
+    redis_stream_maxlen=int(os.getenv('LOG_REDIS_STREAM_MAXLEN', 100000))
+) 
\ No newline at end of file
@@ -0,0 +1,261 @@
+import os
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from api.utils.quantile_sketch import DDSketch
+
+OTHER_ENDPOINT = '__other__'
+
+# Latency percentiles reported by the analytics routes
+REPORTED_QUANTILES = {'p50': 0.5, 'p90': 0.9, 'p95': 0.95, 'p99': 0.99, 'p999': 0.999}
+
+# Rolling windows the analytics routes accept: (seconds per bucket, number of buckets)
+WINDOWS = {
+    '1m': (1, 60),
+    '5m': (10, 30),
+    '1h': (60, 60)
+}
+
+
+class MetricsBucket:
+    """Request and error counters with latency sketches, for the whole process lifetime or one slice of time."""
+
+    __slots__ = ('start', 'relative_accuracy', 'requests', 'errors', 'latency', 'overall')
+
+    def __init__(self, start: float = 0.0, relative_accuracy: float = 0.01):
+        self.start = start
+        self.relative_accuracy = relative_accuracy
+        self.requests: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.latency: Dict[str, DDSketch] = {}
+        self.overall = DDSketch(relative_accuracy)
+
+    def record_request(self, method: str, endpoint: str, status_code: int, duration_ms: float):
+        self.requests[(method, endpoint, status_code)] += 1
+        sketch = self.latency.get(endpoint)
+        if sketch is None:
+            sketch = self.latency[endpoint] = DDSketch(self.relative_accuracy)
+        sketch.add(duration_ms)
+        self.overall.add(duration_ms)
+
+    def record_error(self, method: str, endpoint: str, error_type: str):
+        self.errors[(method, endpoint, error_type)] += 1
+
+    def merge(self, other: 'MetricsBucket'):
+        self.requests.update(other.requests)
+        self.errors.update(other.errors)
+        for endpoint, sketch in other.latency.items():
+            if endpoint in self.latency:
+                self.latency[endpoint].merge(sketch)
+            else:
+                self.latency[endpoint] = sketch.copy()
+        self.overall.merge(other.overall)
+
+    def copy(self) -> 'MetricsBucket':
+        bucket = MetricsBucket(self.start, self.relative_accuracy)
+        bucket.merge(self)
+        return bucket
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'start': self.start,
+            'requests': [[*key, count] for key, count in self.requests.items()],
+            'errors': [[*key, count] for key, count in self.errors.items()],
+            'latency': {endpoint: sketch.to_dict() for endpoint, sketch in self.latency.items()},
+            'overall': self.overall.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MetricsBucket':
+        overall = DDSketch.from_dict(data['overall'])
+        bucket = cls(data['start'], overall.relative_accuracy)
+        bucket.requests = Counter({tuple(item[:-1]): item[-1] for item in data['requests']})
+        bucket.errors = Counter({tuple(item[:-1]): item[-1] for item in data['errors']})
+        bucket.latency = {endpoint: DDSketch.from_dict(sketch) for endpoint, sketch in data['latency'].items()}
+        bucket.overall = overall
+        return bucket
+
+
+class RollingWindow:
+    """Ring buffer of fixed-length time buckets; a slot is reused once its bucket has aged out of the window."""
+
+    def __init__(self, bucket_seconds: int, size: int, relative_accuracy: float = 0.01):
+        self.bucket_seconds = bucket_seconds
+        self.size = size
+        self.relative_accuracy = relative_accuracy
+        self.slots: List[Optional[MetricsBucket]] = [None] * size
+
+    def _start(self, now: float) -> int:
+        return int(now // self.bucket_seconds) * self.bucket_seconds
+
+    def bucket(self, now: float) -> MetricsBucket:
+        """The bucket `now` falls in, replacing whatever stale bucket held its slot."""
+        start = self._start(now)
+        slot = self.slot(start)
+        bucket = self.slots[slot]
+        if bucket is None or bucket.start != start:
+            bucket = self.slots[slot] = MetricsBucket(start, self.relative_accuracy)
+        return bucket
+
+    def slot(self, start: int) -> int:
+        return (start // self.bucket_seconds) % self.size
+
+    def starts(self, now: float) -> List[int]:
+        """Start times of the buckets in the window ending at `now`, oldest first."""
+        current = self._start(now)
+        return [current - age * self.bucket_seconds for age in range(self.size - 1, -1, -1)]
+
+    def changed_since(self, since: float, now: float) -> List[MetricsBucket]:
+        """Buckets still in the window that could have been written to after `since`."""
+        oldest = now - self.bucket_seconds * self.size
+        return [bucket for bucket in self.slots
+                if bucket is not None and bucket.start + self.bucket_seconds > max(since, oldest)]
+
+    def buckets(self, now: float) -> List[MetricsBucket]:
+        """Buckets in the window ending at `now`, oldest first, with empty ones for quiet periods."""
+        # Only the current bucket is still written to, so it is the only one copied; a reused slot gets a new bucket
+        # rather than clearing the old one, so older buckets can be handed out as they are
+        current = self._start(now)
+        buckets = []
+        for start in self.starts(now):
+            bucket = self.slots[self.slot(start)]
+            if bucket is None or bucket.start != start:
+                bucket = MetricsBucket(start, self.relative_accuracy)
+            buckets.append(bucket.copy() if start == current else bucket)
+        return buckets
+
+    def clear(self):
+        self.slots = [None] * self.size
+
+
+class MetricsRegistry:
+    """Request counters and latency sketches, updated as requests complete so reading them costs the same at any traffic volume."""
+
+    def __init__(self, max_endpoints: int = 500, recent_size: int = 10, relative_accuracy: float = 0.01):
+        self.max_endpoints = max_endpoints
+        self.relative_accuracy = relative_accuracy
+        self.totals = MetricsBucket(relative_accuracy=relative_accuracy)
+        self.windows = {name: RollingWindow(seconds, size, relative_accuracy) for name, (seconds, size) in WINDOWS.items()}
+        self.recent: deque = deque(maxlen=recent_size)
+        self._lock = threading.Lock()
+
+    def _endpoint(self, path: str) -> str:
+        # Paths that never matched a route are caller-controlled, so their number is capped
+        if path in self.totals.latency or len(self.totals.latency) < self.max_endpoints:
+            return path
+        return OTHER_ENDPOINT
+
+    def _buckets(self, now: float) -> List[MetricsBucket]:
+        return [self.totals] + [window.bucket(now) for window in self.windows.values()]
+
+    def record_request(self, method: str, path: str, status_code: int, duration_ms: float, timestamp: Optional[str] = None):
+        """Count a completed request; `path` should be the route template, not the concrete URL."""
+        with self._lock:
+            # Read under the lock, so no write lands in a bucket older than one a snapshot has already seen as past
+            now = time.time()
+            endpoint = self._endpoint(path)
+            for bucket in self._buckets(now):
+                bucket.record_request(method, endpoint, status_code, duration_ms)
+            self.recent.append({
+                'timestamp': timestamp or '',
+                'method': method,
+                'path': path,
+                'status_code': status_code,
+                'duration_ms': duration_ms
+            })
+
+    def record_error(self, method: str, path: str, error_type: str):
+        """Count a request that raised instead of returning a response."""
+        with self._lock:
+            now = time.time()
+            endpoint = self._endpoint(path)
+            for bucket in self._buckets(now):
+                bucket.record_error(method, endpoint, error_type)
+
+    def snapshot(self, window: Optional[str] = None) -> Dict[str, Any]:
+        """Copy of the aggregates since start, or over a rolling window along with its buckets."""
+        if window is not None and window not in self.windows:
+            raise ValueError(f"window must be one of {tuple(self.windows)}, got {window!r}")
+        with self._lock:
+            if window is None:
+                totals, buckets = self.totals.copy(), None
+            else:
+                buckets = self.windows[window].buckets(time.time())
+            recent = list(self.recent)
+
+        # Merged outside the lock, so requests don't wait on up to an hour of buckets being combined
+        if buckets is not None:
+            totals = MetricsBucket(buckets[0].start, self.relative_accuracy)
+            for bucket in buckets:
+                totals.merge(bucket)
+        return {
+            'requests': totals.requests,
+            'errors': totals.errors,
+            'latency': totals.latency,
+            'overall': totals.overall,
+            'recent': recent,
+            'buckets': buckets
+        }
+
+    def export(self, since: float, now: float) -> Dict[str, Any]:
+        """Serializable totals, recent requests and the window buckets written to after `since`, for other workers to merge."""
+        with self._lock:
+            return {
+                'totals': self.totals.to_dict(),
+                'recent': list(self.recent),
+                'windows': {name: [bucket.to_dict() for bucket in window.changed_since(since, now)]
+                            for name, window in self.windows.items()}
+            }
+
+    def reset(self):
+        with self._lock:
+            self.totals = MetricsBucket(relative_accuracy=self.relative_accuracy)
+            for window in self.windows.values():
+                window.clear()
+            self.recent.clear()
+
+
+def group_counts(counter: Counter, position: int) -> Dict[Any, int]:
+    """Sum a counter keyed by tuples over every component but `position`."""
+    grouped: Counter = Counter()
+    for key, count in counter.items():
+        grouped[key[position]] += count
+    return dict(grouped)
+
+
+def top_counts(counter: Counter, position: int, n: int) -> List[Tuple[Any, int]]:
+    return Counter(group_counts(counter, position)).most_common(n)
+
+
+def latency_quantiles(sketch: DDSketch) -> Dict[str, Optional[float]]:
+    return {name: _round(sketch.quantile(q)) for name, q in REPORTED_QUANTILES.items()}
+
+
+def timeseries(buckets: List[MetricsBucket]) -> List[Dict[str, Any]]:
+    """One point per bucket, oldest first, small enough for the dashboard to chart as is."""
+    return [
+        {
+            'start': datetime.fromtimestamp(bucket.start).isoformat(),
+            'requests': bucket.overall.count,
+            'errors': sum(bucket.errors.values()),
+            'avg_response_time': _round(bucket.overall.mean()),
+            'p50': _round(bucket.overall.quantile(0.5)),
+            'p90': _round(bucket.overall.quantile(0.9)),
+            'p99': _round(bucket.overall.quantile(0.99))
+        }
+        for bucket in buckets
+    ]
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
+
+
+# Global registry updated by PerformanceMiddleware
+metrics = MetricsRegistry(
+    max_endpoints=int(os.getenv('METRICS_MAX_ENDPOINTS', 500)),
+    relative_accuracy=float(os.getenv('METRICS_RELATIVE_ACCURACY', 0.01))
+)
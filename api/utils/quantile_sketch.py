@@ -0,0 +1,118 @@
+import math
+from typing import Any, Dict, Optional
+
+# Values at or below this are counted as zero, since the logarithmic bins can't hold them
+MIN_INDEXABLE_VALUE = 1e-6
+
+
+class DDSketch:
+    """Mergeable quantile sketch (DDSketch): every quantile is within `relative_accuracy` of the exact value.
+
+    Values fall into logarithmic bins, so memory grows with the range of values rather than their number; past
+    `max_bins` the lowest bins are folded together, which only costs accuracy at the low end.
+    """
+
+    __slots__ = ('relative_accuracy', 'max_bins', 'gamma', '_log_gamma', 'bins', 'zero_count', 'count', 'total', 'min', 'max')
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy must be between 0 and 1, got {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _index(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, index: int) -> float:
+        # Midpoint of the bin (gamma^(i-1), gamma^i] in relative terms, so either edge is within the accuracy
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def add(self, value: float, count: int = 1):
+        if value <= MIN_INDEXABLE_VALUE:
+            self.zero_count += count
+        else:
+            index = self._index(value)
+            self.bins[index] = self.bins.get(index, 0) + count
+            if len(self.bins) > self.max_bins:
+                self._collapse()
+        self.count += count
+        self.total += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def _collapse(self):
+        indexes = sorted(self.bins)
+        overflow = indexes[:len(indexes) - self.max_bins]
+        target = indexes[len(overflow)]
+        self.bins[target] += sum(self.bins.pop(index) for index in overflow)
+
+    def merge(self, other: 'DDSketch'):
+        """Add every value of another sketch built with the same relative accuracy."""
+        if other.gamma != self.gamma:
+            raise ValueError("Sketches with different relative accuracy can't be merged")
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        while len(self.bins) > self.max_bins:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def copy(self) -> 'DDSketch':
+        sketch = DDSketch(self.relative_accuracy, self.max_bins)
+        sketch.merge(self)
+        return sketch
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate of the q-th quantile (0 <= q <= 1), or None for an empty sketch."""
+        if self.count == 0:
+            return None
+        # Nearest rank: the smallest value with at least a fraction q of all values at or below it
+        rank = max(math.ceil(q * self.count) - 1, 0)
+        seen = self.zero_count
+        if seen > rank:
+            return self.min if self.min is not None and self.min <= MIN_INDEXABLE_VALUE else 0.0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen > rank:
+                # The exact extremes are known, so estimates never fall outside them
+                return min(max(self._value(index), self.min), self.max)
+        return self.max
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'max_bins': self.max_bins,
+            'bins': {str(index): count for index, count in self.bins.items()},
+            'zero_count': self.zero_count,
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DDSketch':
+        sketch = cls(data['relative_accuracy'], data['max_bins'])
+        sketch.bins = {int(index): count for index, count in data['bins'].items()}
+        sketch.zero_count = data['zero_count']
+        sketch.count = data['count']
+        sketch.total = data['total']
+        sketch.min = data['min']
+        sketch.max = data['max']
+        return sketch
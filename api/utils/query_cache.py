@@ -0,0 +1,127 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from pydantic import BaseModel
+
+from api.domain.models.book import Book
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate the memory retained by a cached result beyond what the catalog already holds."""
+    if isinstance(value, Book):
+        # Results reference the catalog's own Book objects, which stay alive whether or not the result is cached
+        return 0
+    if isinstance(value, BaseModel):
+        return sys.getsizeof(value) + sum(_estimate_size(field) for field in value.__dict__.values())
+    if isinstance(value, (list, tuple)) and value and isinstance(value[0], Book):
+        # A page of catalog books only adds its own reference slots, so the books themselves are not walked
+        return sys.getsizeof(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(_estimate_size(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_estimate_size(k) + _estimate_size(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+def _normalize(value: Any) -> Hashable:
+    if isinstance(value, str):
+        # Matching is case-insensitive via str.lower(), so the key folds case the same way
+        return value.lower()
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(item) for item in value)
+    return value
+
+
+class _Flight:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class QueryResultCache:
+    """Byte-bounded LRU cache of query results with single-flight computation on misses."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Tuple, Tuple[Any, int]] = OrderedDict()
+        self._flights: Dict[Tuple, _Flight] = {}
+        self._catalog_version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(name: str, catalog_version: str, **params: Any) -> Tuple:
+        """Build a key from the normalized, name-sorted parameters; unset parameters are ignored."""
+        normalized = tuple(sorted((param, _normalize(value)) for param, value in params.items() if value not in (None, '')))
+        return name, catalog_version, normalized
+
+    def get_or_compute(self, key: Tuple, compute: Callable[[], Any]) -> Any:
+        """Return the cached result for key, computing it once even when many callers miss together."""
+        with self._lock:
+            self._drop_stale_versions(key[1])
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            self.misses += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = compute()
+            self._store(key, flight.result)
+            return flight.result
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _drop_stale_versions(self, catalog_version: str):
+        """Results of an older catalog can never be hit again, so release them as soon as the version moves."""
+        if catalog_version != self._catalog_version:
+            self._entries.clear()
+            self.current_bytes = 0
+            self._catalog_version = catalog_version
+
+    def _store(self, key: Tuple, result: Any):
+        size = _estimate_size(result)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key[1] != self._catalog_version:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+            self._entries[key] = (result, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+
+# Global cache instance shared by the search use cases
+query_cache = QueryResultCache(max_bytes=int(os.getenv('QUERY_CACHE_MAX_BYTES', 64 * 1024 * 1024)))
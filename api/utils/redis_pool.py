@@ -0,0 +1,18 @@
+import threading
+from typing import Dict
+
+import redis
+
+# One connection pool per Redis URL, shared by every client and thread in the process
+_redis_pools: Dict[str, redis.ConnectionPool] = {}
+_redis_pools_lock = threading.Lock()
+
+
+def get_redis_pool(redis_url: str, max_connections: int = 10) -> redis.ConnectionPool:
+    """Get the process-wide connection pool for a Redis URL, creating it on first use."""
+    with _redis_pools_lock:
+        pool = _redis_pools.get(redis_url)
+        if pool is None:
+            pool = redis.ConnectionPool.from_url(redis_url, max_connections=max_connections)
+            _redis_pools[redis_url] = pool
+        return pool
@@ -0,0 +1,92 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Optional, Tuple
+
+from api.domain.models.scraping import ScrapeJob
+
+
+class _Job:
+    __slots__ = ('id', 'status', 'started_at', 'finished_at', 'started', 'elapsed', 'pages', 'books', 'result', 'error')
+
+    def __init__(self):
+        self.id = str(uuid.uuid4())
+        self.status = 'running'
+        self.started_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+        self.started = time.monotonic()
+        self.elapsed: Optional[float] = None
+        self.pages = 0
+        self.books = 0
+        self.result: Optional[str] = None
+        self.error: Optional[str] = None
+
+    def snapshot(self) -> ScrapeJob:
+        elapsed = self.elapsed if self.elapsed is not None else time.monotonic() - self.started
+        return ScrapeJob(
+            id=self.id,
+            status=self.status,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            elapsed_seconds=round(elapsed, 3),
+            pages=self.pages,
+            books=self.books,
+            pages_per_second=round(self.pages / elapsed, 2) if elapsed > 0 else 0.0,
+            books_per_second=round(self.books / elapsed, 2) if elapsed > 0 else 0.0,
+            result=self.result,
+            error=self.error
+        )
+
+
+class ScrapeJobRunner:
+    """Runs scrapes in a background thread, one at a time, keeping the progress of the most recent jobs."""
+
+    def __init__(self, max_jobs: int = 20):
+        self.max_jobs = max_jobs
+        self._jobs: OrderedDict[str, _Job] = OrderedDict()
+        self._running: Optional[_Job] = None
+        self._lock = threading.Lock()
+
+    def start(self, scrape: Callable[..., str]) -> Tuple[ScrapeJob, bool]:
+        """Start scrape(on_page=...) in a worker thread; returns the running job and False if one was already running."""
+        with self._lock:
+            if self._running is not None:
+                return self._running.snapshot(), False
+            job = _Job()
+            self._running = job
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+
+        threading.Thread(target=self._run, args=(job, scrape), name=f'scrape-{job.id}', daemon=True).start()
+        return job.snapshot(), True
+
+    def _run(self, job: _Job, scrape: Callable[..., str]):
+        def on_page(books: int):
+            # Only this thread writes the counters; readers may see them one page behind
+            job.pages += 1
+            job.books += books
+
+        status = 'failed'
+        try:
+            job.result = scrape(on_page=on_page)
+            status = 'succeeded'
+        except Exception as error:
+            job.error = f'{type(error).__name__}: {error}'
+        finally:
+            job.elapsed = time.monotonic() - job.started
+            job.finished_at = datetime.now()
+            with self._lock:
+                job.status = status
+                self._running = None
+
+    def get(self, job_id: str) -> Optional[ScrapeJob]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        return job.snapshot() if job is not None else None
+
+
+scrape_jobs = ScrapeJobRunner(max_jobs=int(os.getenv('SCRAPE_JOBS_HISTORY', 20)))
@@ -0,0 +1,190 @@
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import redis
+
+from api.utils.metrics import WINDOWS, MetricsBucket, MetricsRegistry, RollingWindow, metrics
+from api.utils.redis_pool import get_redis_pool
+
+KEY_PREFIX = 'metrics'
+
+
+class SharedMetrics:
+    """Deployment-wide view of the metrics registry: every worker publishes its aggregates to Redis and readers merge them.
+
+    Publishing happens in the background every `interval` seconds and only sends the window buckets written since the
+    last publish, so a request never waits on Redis and a read never contacts other workers. Figures are at most about
+    two intervals stale. Without a Redis client, everything is served from the local registry.
+
+    Totals since start only cover live workers: once a worker has stopped publishing for `worker_ttl` seconds (about
+    an hour), its keys expire and its requests drop out of the totals, so they can shrink after a restart or scale-down.
+    Snapshots make blocking Redis calls and must not be taken on the event loop.
+    """
+
+    def __init__(self, registry: MetricsRegistry, client: Optional['redis.Redis'] = None, interval: float = 5.0):
+        self.registry = registry
+        self.client = client
+        self.interval = interval
+        # A worker that stops publishing still counts until its oldest bucket would have left the longest window
+        self.worker_ttl = max(seconds * size for seconds, size in WINDOWS.values()) + int(2 * interval)
+        self._pid: Optional[int] = None
+        self._worker_id: Optional[str] = None
+        self._publisher: Optional[threading.Thread] = None
+        self._publisher_lock = threading.Lock()
+        self._publish_lock = threading.Lock()
+        self._last_publish = 0.0
+        self._cache: Dict[Optional[str], tuple] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.client is not None
+
+    def record_request(self, method: str, path: str, status_code: int, duration_ms: float, timestamp: Optional[str] = None):
+        self.registry.record_request(method, path, status_code, duration_ms, timestamp)
+        self._ensure_publisher()
+
+    def record_error(self, method: str, path: str, error_type: str):
+        self.registry.record_error(method, path, error_type)
+        self._ensure_publisher()
+
+    def _ensure_publisher(self):
+        if not self.enabled or (self._pid == os.getpid() and self._publisher.is_alive()):
+            return
+        with self._publisher_lock:
+            if self._pid != os.getpid() or not self._publisher.is_alive():
+                # A forked worker gets an identity of its own, so it never overwrites its parent's aggregates
+                if self._pid != os.getpid():
+                    self._pid = os.getpid()
+                    self._worker_id = f'{socket.gethostname()}:{self._pid}:{uuid.uuid4().hex[:8]}'
+                    self._last_publish = 0.0
+                self._publisher = threading.Thread(target=self._run, name='metrics-publisher', daemon=True)
+                self._publisher.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.publish()
+
+    def _key(self, worker_id: str, part: str) -> str:
+        return f'{KEY_PREFIX}:worker:{worker_id}:{part}'
+
+    def publish(self):
+        """Send this worker's totals and the window buckets changed since the last publish in one pipeline."""
+        with self._publish_lock:
+            now = time.time()
+            exported = self.registry.export(self._last_publish, now)
+            try:
+                pipe = self.client.pipeline(transaction=False)
+                pipe.set(self._key(self._worker_id, 'totals'),
+                         json.dumps({'totals': exported['totals'], 'recent': exported['recent']}), ex=self.worker_ttl)
+                for name, buckets in exported['windows'].items():
+                    window_key = self._key(self._worker_id, name)
+                    window = self.registry.windows[name]
+                    # Fields are ring slots, so the hash never holds more than one window's worth of buckets
+                    if buckets:
+                        pipe.hset(window_key, mapping={str(window.slot(bucket['start'])): json.dumps(bucket) for bucket in buckets})
+                    pipe.expire(window_key, self.worker_ttl)
+                pipe.zadd(f'{KEY_PREFIX}:workers', {self._worker_id: now})
+                pipe.zremrangebyscore(f'{KEY_PREFIX}:workers', '-inf', now - self.worker_ttl)
+                pipe.execute()
+                self._last_publish = now
+            except Exception as e:
+                print(f"Failed to publish metrics to Redis: {e}")
+
+    def snapshot(self, window: Optional[str] = None) -> Dict[str, Any]:
+        """Same shape as MetricsRegistry.snapshot, merged across every live worker and cached for `interval` seconds."""
+        if not self.enabled:
+            return {**self.registry.snapshot(window), 'workers': 1}
+        if window is not None and window not in self.registry.windows:
+            raise ValueError(f"window must be one of {tuple(self.registry.windows)}, got {window!r}")
+
+        self._ensure_publisher()
+        cached = self._cache.get(window)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        # This worker's own figures are never older than one interval, even before the publisher's first run
+        if time.time() - self._last_publish >= self.interval:
+            self.publish()
+        try:
+            snapshot = self._collect(window)
+        except Exception as e:
+            print(f"Failed to collect metrics from Redis: {e}")
+            return {**self.registry.snapshot(window), 'workers': 1}
+        self._cache[window] = (time.monotonic() + self.interval, snapshot)
+        return snapshot
+
+    def _collect(self, window: Optional[str]) -> Dict[str, Any]:
+        now = time.time()
+        workers = [_decode(worker) for worker in self.client.zrangebyscore(f'{KEY_PREFIX}:workers', now - self.worker_ttl, '+inf')]
+        pipe = self.client.pipeline(transaction=False)
+        for worker_id in workers:
+            pipe.get(self._key(worker_id, 'totals'))
+            if window is not None:
+                pipe.hvals(self._key(worker_id, window))
+        replies = pipe.execute()
+
+        per_worker = 2 if window is not None else 1
+        published = [json.loads(reply) for reply in replies[::per_worker] if reply is not None]
+        recent = sorted((call for data in published for call in data['recent']), key=lambda call: call['timestamp'])
+        recent = recent[-self.registry.recent.maxlen:]
+
+        buckets: Optional[List[MetricsBucket]] = None
+        if window is None:
+            totals = MetricsBucket(relative_accuracy=self.registry.relative_accuracy)
+            for data in published:
+                totals.merge(MetricsBucket.from_dict(data['totals']))
+        else:
+            buckets = self._merge_window(self.registry.windows[window], replies[1::2], now)
+            totals = MetricsBucket(buckets[0].start, self.registry.relative_accuracy)
+            for bucket in buckets:
+                totals.merge(bucket)
+
+        return {
+            'requests': totals.requests,
+            'errors': totals.errors,
+            'latency': totals.latency,
+            'overall': totals.overall,
+            'recent': recent,
+            'buckets': buckets,
+            'workers': len(published)
+        }
+
+    def _merge_window(self, window: RollingWindow, replies: List[List[bytes]], now: float) -> List[MetricsBucket]:
+        """Merge every worker's buckets by start time; buckets that have left the window are skipped."""
+        merged = {start: MetricsBucket(start, self.registry.relative_accuracy) for start in window.starts(now)}
+        for values in replies:
+            for value in values:
+                bucket = MetricsBucket.from_dict(json.loads(value))
+                if bucket.start in merged:
+                    merged[bucket.start].merge(bucket)
+        return list(merged.values())
+
+    def reset(self):
+        """Reset this worker's figures; other workers keep theirs until they are reset too."""
+        self.registry.reset()
+        self._cache.clear()
+        if self.enabled and self._worker_id is not None:
+            try:
+                self.client.delete(*(self._key(self._worker_id, part) for part in ('totals', *WINDOWS)))
+            except Exception as e:
+                print(f"Failed to clear metrics in Redis: {e}")
+
+
+def _decode(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _shared_client() -> Optional['redis.Redis']:
+    redis_url = os.getenv('REDIS_URL')
+    if not redis_url or os.getenv('METRICS_SHARED', 'redis') == 'off':
+        return None
+    return redis.Redis(connection_pool=get_redis_pool(redis_url, int(os.getenv('REDIS_MAX_CONNECTIONS', 10))))
+
+
+# Global deployment-wide view used by PerformanceMiddleware and the analytics routes
+shared_metrics = SharedMetrics(metrics, _shared_client(), interval=float(os.getenv('METRICS_PUBLISH_INTERVAL', 5.0)))
@@ -0,0 +1,16 @@
+import re
+import unicodedata
+from typing import List
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase text and strip accents so 'Ficção' and 'ficcao' compare equal."""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into normalized alphanumeric words."""
+    return _WORD_RE.findall(normalize_text(text))
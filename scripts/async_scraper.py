@@ -0,0 +1,193 @@
+import asyncio
+import multiprocessing
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urljoin, urlsplit
+
+import httpx
+
+from scripts.scrape_books import (BASE_URL, RETRY_STATUSES, category_page_url, page_found, parse_category_pages,
+                                  process_index_page, remember_category_page, retry_delay, reuse_category_page)
+
+USER_AGENT = "book-search-scraper/1.0"
+PARSE_BATCH_SIZE = 8
+CATEGORIES_IN_FLIGHT = 4
+
+
+class TokenBucket:
+    """Token bucket rate limiter: `rate` requests per second on average, bursts of up to `capacity`."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncFetcher:
+    """Shared keep-alive connection pool with per-host concurrency, rate limiting and retry with backoff."""
+
+    def __init__(self, concurrency=8, rate=10.0, burst=None, retries=3, backoff=0.5, timeout=30.0):
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.bucket = TokenBucket(rate, burst)
+        self.host_slots = defaultdict(lambda: asyncio.Semaphore(concurrency))
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=concurrency * 2, max_keepalive_connections=concurrency),
+            timeout=timeout,
+            headers={"User-Agent": USER_AGENT},
+            follow_redirects=True
+        )
+        self.requests = 0
+        self.failures = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+
+    async def get(self, url, headers=None):
+        """GET a URL, retrying transport errors and retryable statuses; returns the last response or None."""
+        response = None
+        for attempt in range(self.retries + 1):
+            await self.bucket.acquire()
+            async with self.host_slots[urlsplit(url).netloc]:
+                self.requests += 1
+                try:
+                    response = await self.client.get(url, headers=headers)
+                except httpx.TransportError as error:
+                    print(f"⚠️  {url}: {error}")
+                    response = None
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                return response
+            if attempt < self.retries:
+                await asyncio.sleep(retry_delay(attempt, self.backoff, response))
+        self.failures += 1
+        return response
+
+
+class PageParser:
+    """Parse stage of the pipeline: inline, or in a pool of worker processes fed with batches of pages."""
+
+    def __init__(self, workers=0, batch_size=PARSE_BATCH_SIZE):
+        self.batch_size = batch_size
+        # Spawned rather than forked, since the scraper may run in a thread of the API process
+        self.pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) if workers > 0 else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    async def parse(self, pages):
+        """(books, page_count) of each (html, category, base_url), in the order given."""
+        if self.pool is None:
+            return parse_category_pages(pages)
+        loop = asyncio.get_running_loop()
+        batches = [pages[start:start + self.batch_size] for start in range(0, len(pages), self.batch_size)]
+        results = await asyncio.gather(*(loop.run_in_executor(self.pool, parse_category_pages, batch) for batch in batches))
+        return [result for batch in results for result in batch]
+
+
+async def _fetch(fetcher, url, state):
+    return await fetcher.get(url, headers=state.request_headers(url) if state else None)
+
+
+async def _process_pages(parser, pages, category_name, base_url, state=None):
+    """(books, page_count) of each fetched (url, response); unchanged pages are reused, the rest go to the parse stage."""
+    results = [reuse_category_page(url, response, state) for url, response in pages]
+    to_parse = [position for position, result in enumerate(results) if result is None]
+    parsed = await parser.parse([(pages[position][1].content, category_name, base_url) for position in to_parse])
+    for position, (books, page_count) in zip(to_parse, parsed):
+        url, response = pages[position]
+        remember_category_page(url, response, books, page_count, state)
+        results[position] = (books, page_count)
+    return results
+
+
+async def _scrape_category(fetcher, parser, writer, base_url, rel_url, category_name, state=None, enricher=None):
+    """(url, books) of each new page of a category, in page order."""
+    first_url = category_page_url(rel_url, 1, base_url)
+    first = await _fetch(fetcher, first_url, state)
+    if not page_found(first_url, first):
+        return []
+
+    # The first page is fetched even when already checkpointed, since it carries the page count
+    [(books, page_count)] = await _process_pages(parser, [(first_url, first)], category_name, base_url, state)
+    pages = [] if writer.page_done(first_url) else [(first_url, books)]
+    page_urls = [url for url in (category_page_url(rel_url, page, base_url) for page in range(2, page_count + 1)) if not writer.page_done(url)]
+    responses = await asyncio.gather(*(_fetch(fetcher, page_url, state) for page_url in page_urls))
+
+    # Mirrors the serial crawl, which stops at the first missing page or page with no books and raises on any other failure
+    fetched = []
+    for page_url, response in zip(page_urls, responses):
+        if not page_found(page_url, response):
+            break
+        fetched.append((page_url, response))
+    for (page_url, _), (page_books, _) in zip(fetched, await _process_pages(parser, fetched, category_name, base_url, state)):
+        if not page_books:
+            break
+        pages.append((page_url, page_books))
+
+    if enricher is not None:
+        enriched = await asyncio.gather(*(enricher.enrich_async(fetcher, page_books) for _, page_books in pages))
+        pages = [(page_url, page_books) for (page_url, _), page_books in zip(pages, enriched)]
+    return pages
+
+
+async def scrape_async_books(writer, base_url=BASE_URL, concurrency=8, rate=10.0, burst=None, retries=3, backoff=0.5,
+                             parse_workers=0, categories_in_flight=CATEGORIES_IN_FLIGHT, state=None, enricher=None):
+    async with AsyncFetcher(concurrency, rate, burst, retries, backoff) as fetcher:
+        with PageParser(parse_workers) as parser:
+            index_url = urljoin(base_url, "index.html")
+            index = await _fetch(fetcher, index_url, state)
+            if index is None or index.status_code not in (200, 304):
+                raise RuntimeError(f"Não foi possível carregar a lista de categorias de {base_url}")
+            categories = process_index_page(index_url, index, state)
+
+            # Categories are fetched and parsed concurrently but written in index order, like the serial scrape. Only
+            # `categories_in_flight` run ahead of the one being written, so buffered pages don't grow with the catalog
+            pending = deque()
+            for rel_url, category_name in categories.items():
+                category_url = category_page_url(rel_url, 1, base_url)
+                if not writer.category_done(category_url):
+                    pending.append((category_url, rel_url, category_name))
+            tasks = deque()
+            try:
+                while pending or tasks:
+                    while pending and len(tasks) < categories_in_flight:
+                        category_url, rel_url, category_name = pending.popleft()
+                        tasks.append((category_url, asyncio.create_task(
+                            _scrape_category(fetcher, parser, writer, base_url, rel_url, category_name, state, enricher)
+                        )))
+                    category_url, task = tasks.popleft()
+                    for page_url, books in await task:
+                        writer.add_page(page_url, books)
+                    writer.complete_category(category_url)
+            except BaseException:
+                for _, task in tasks:
+                    task.cancel()
+                await asyncio.gather(*(task for _, task in tasks), return_exceptions=True)
+                raise
+        print(f"🌐 {fetcher.requests} requisições, {fetcher.failures} falhas")
+
+
+def scrape_async(writer, base_url=BASE_URL, **options):
+    asyncio.run(scrape_async_books(writer, base_url, **options))
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Verifica e mede o parsing de páginas do scraper sobre um corpus de páginas gravadas.
+Compara a implementação de referência (árvore completa com html.parser) com os caminhos rápidos
+(SoupStrainer com html.parser e XPath com lxml) e falha se qualquer página produzir saída diferente.
+"""
+
+import argparse
+import glob
+import os
+import time
+
+from bs4 import BeautifulSoup
+
+from scripts import scrape_books
+from scripts.fixture_site import CORPUS_DIR, corpus_digest
+from scripts.scrape_books import (book_id, parse_categories_soup, parse_category_page_soup, parse_price,
+                                  product_path, rating_to_int)
+
+
+def reference_extract_book_data(article, category, base_url):
+    return {
+        "id": book_id(article.h3.a["href"]),
+        "title": article.h3.a["title"],
+        "price": parse_price(article.select_one(".price_color").text),
+        "rating": rating_to_int(article.p["class"][1]),
+        "availability": article.select_one(".availability").text.strip(),
+        "category": category,
+        "image": base_url + article.img["src"].replace("../", ""),
+        "url": base_url + product_path(article.h3.a["href"])
+    }
+
+
+def reference_parse_category_page(html, category, base_url):
+    soup = BeautifulSoup(html, "html.parser")
+    books = [reference_extract_book_data(article, category, base_url) for article in soup.select("article.product_pod")]
+    current = soup.select_one("ul.pager li.current")
+    try:
+        page_count = int(current.text.split()[-1]) if current is not None else 1
+    except ValueError:
+        page_count = 1
+    return books, page_count
+
+
+def reference_parse_categories(html):
+    soup = BeautifulSoup(html, "html.parser")
+    return {str(link["href"]): link.text.strip() for link in soup.select(".side_categories ul li ul li a")}
+
+
+def load_corpus(corpus_dir):
+    if not os.path.exists(os.path.join(corpus_dir, "index.html")):
+        raise SystemExit(f"Corpus não encontrado em {corpus_dir}; gere-o com 'make fixtures' "
+                         f"(python -m scripts.fixture_site generate) ou grave o site com 'python -m scripts.fixture_site record'")
+    with open(os.path.join(corpus_dir, "index.html"), "rb") as f:
+        index = f.read()
+    pages = []
+    for path in sorted(glob.glob(os.path.join(corpus_dir, "catalogue", "category", "books", "*", "*.html"))):
+        with open(path, "rb") as f:
+            pages.append((os.path.basename(os.path.dirname(path)), f.read()))
+    return index, pages
+
+
+def parsers():
+    candidates = {"strainer (html.parser)": (parse_categories_soup, parse_category_page_soup)}
+    if scrape_books.HTML_PARSER == "lxml":
+        from scripts import fast_parser
+        candidates["xpath (lxml)"] = (fast_parser.parse_categories, fast_parser.parse_category_page)
+    return candidates
+
+
+def verify(index, pages, base_url, candidates):
+    mismatches = 0
+    for label, (parse_categories, parse_category_page) in candidates.items():
+        if parse_categories(index) != reference_parse_categories(index):
+            print(f"❌ {label} index.html: categorias diferentes")
+            mismatches += 1
+        for category, html in pages:
+            if parse_category_page(html, category, base_url) != reference_parse_category_page(html, category, base_url):
+                print(f"❌ {label} {category}: saída diferente")
+                mismatches += 1
+    return mismatches
+
+
+def measure(label, parse, pages, base_url, rounds):
+    total_bytes = sum(len(html) for _, html in pages) * rounds
+    start = time.perf_counter()
+    books = 0
+    for _ in range(rounds):
+        for category, html in pages:
+            books += len(parse(html, category, base_url)[0])
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {len(pages) * rounds / elapsed:>9.1f} páginas/s {books / elapsed:>10.1f} livros/s {total_bytes / elapsed / 1e6:>7.2f} MB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verifica e mede o parsing das páginas do scraper")
+    parser.add_argument("--corpus", default=CORPUS_DIR, help="Diretório com o site gravado (index.html + catalogue/)")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    base_url = scrape_books.BASE_URL
+    index, pages = load_corpus(args.corpus)
+    print(f"📄 {len(pages)} páginas de categoria em {args.corpus} (sha256 {corpus_digest(args.corpus)})")
+
+    candidates = parsers()
+    mismatches = verify(index, pages, base_url, candidates)
+    if mismatches:
+        raise SystemExit(f"{mismatches} páginas com saída diferente da referência")
+    print("✅ Saída idêntica à implementação de referência")
+
+    measure("referência (html.parser)", reference_parse_category_page, pages, base_url, args.rounds)
+    for label, (_, parse_category_page) in candidates.items():
+        measure(label, parse_category_page, pages, base_url, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Mede o scraper contra o site de fixtures local: páginas/s, livros/s, tempo de CPU e pico de RSS dos modos
+serial e concorrente, e confere que todos os modos produzem exatamente o mesmo CSV.
+"""
+
+import argparse
+import contextlib
+import filecmp
+import io
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from scripts.fixture_site import CORPUS_DIR, corpus_digest, start_server
+from scripts.scrape_books import scrape
+
+
+def _rss_mb(max_rss):
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return max_rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _run(mode, base_url, output_file, options, results):
+    """Scrape in a fresh process, so peak RSS and CPU time belong to this run alone."""
+    counts = {"pages": 0, "books": 0}
+
+    def on_page(books):
+        counts["pages"] += 1
+        counts["books"] += books
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        scrape(mode, base_url, output_file, on_page=on_page, **options)
+    elapsed = time.perf_counter() - start
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    workers = resource.getrusage(resource.RUSAGE_CHILDREN)
+    results.put({
+        **counts,
+        "elapsed": elapsed,
+        "cpu": own.ru_utime + own.ru_stime + workers.ru_utime + workers.ru_stime,
+        "rss": _rss_mb(own.ru_maxrss),
+        "workers_rss": _rss_mb(workers.ru_maxrss)
+    })
+
+
+def measure(label, mode, base_url, output_file, options):
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_run, args=(mode, base_url, output_file, options, results))
+    process.start()
+    process.join()
+    if process.exitcode != 0:
+        raise SystemExit(f"{label}: o scraping terminou com código {process.exitcode}")
+    result = results.get()
+    workers_rss = f" (+{result['workers_rss']:.0f} MB por worker)" if result["workers_rss"] else ""
+    print(
+        f"{label:<26} {result['elapsed']:>7.2f} s {result['pages'] / result['elapsed']:>8.1f} páginas/s "
+        f"{result['books'] / result['elapsed']:>9.1f} livros/s {result['cpu']:>6.2f} s CPU {result['rss']:>6.0f} MB RSS{workers_rss}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do scraper contra o site de fixtures local")
+    parser.add_argument("--corpus", default=CORPUS_DIR, help="Diretório com o site gravado ou gerado (scripts.fixture_site)")
+    parser.add_argument("--modes", nargs="+", choices=["serial", "async"], default=["serial", "async"])
+    parser.add_argument("--latency", type=float, default=0.0, help="Atraso fixo por requisição do servidor, em segundos")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Atraso aleatório extra de até N segundos")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fração das requisições respondidas com erro")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--delay", type=float, default=0.0, help="Pausa entre páginas do modo serial")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=1000.0, help="Requisições por segundo do modo async")
+    parser.add_argument("--parse-workers", type=int, nargs="+", default=[0], help="Rodadas do modo async com N processos de parsing")
+    args = parser.parse_args()
+
+    server = start_server(args.corpus, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, error_status=args.error_status)
+    print(f"🌐 {args.corpus} (sha256 {corpus_digest(args.corpus)}) servido em {server.base_url} "
+          f"(latência {args.latency * 1000:.0f} ms, erros {args.error_rate:.0%})")
+
+    runs = []
+    if "serial" in args.modes:
+        runs.append(("serial", "serial", {"delay": args.delay}))
+    if "async" in args.modes:
+        for workers in args.parse_workers:
+            options = {"concurrency": args.concurrency, "rate": args.rate, "parse_workers": workers}
+            runs.append((f"async ({workers} workers)", "async", options))
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        outputs = []
+        for position, (label, mode, options) in enumerate(runs):
+            output_file = os.path.join(output_dir, str(position), "books.csv")
+            measure(label, mode, server.base_url, output_file, options)
+            outputs.append((label, output_file))
+
+        reference_label, reference_file = outputs[0]
+        for label, output_file in outputs[1:]:
+            if not filecmp.cmp(reference_file, output_file, shallow=False):
+                print(f"❌ {label}: CSV diferente de {reference_label}")
+        print(f"📊 {server.requests} requisições servidas, {server.errors} com erro injetado")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
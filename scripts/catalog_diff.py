@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import pandas as pd
+
+MANIFEST_FILE_NAME = "catalog_manifest.json"
+CHANGELOG_FILE_NAME = "catalog_changelog.jsonl"
+LISTING_FIELDS = ("title", "price", "rating", "availability", "category", "image")
+DETAIL_FIELDS = ("upc", "description", "stock")
+COMPARED_FIELDS = LISTING_FIELDS + DETAIL_FIELDS
+NUMERIC_FIELDS = ("price", "rating", "stock")
+DIFF_CHUNK_SIZE = 10000
+
+
+@dataclass
+class CatalogDiff:
+    """Book ids added, removed and changed between two scrapes."""
+    added: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    changed: list = field(default_factory=list)
+
+    def is_empty(self):
+        return not (self.added or self.removed or self.changed)
+
+    def summary(self):
+        return {"added": len(self.added), "removed": len(self.removed), "changed": len(self.changed)}
+
+
+def _sidecar(catalog_file, name):
+    return os.path.join(os.path.dirname(catalog_file) or ".", name)
+
+
+def fingerprint(row, fields=COMPARED_FIELDS):
+    # CSV round trips turn missing values into NaN and numbers into numpy scalars; compare normalized values
+    values = []
+    for name in fields:
+        value = row.get(name)
+        if value is None or (isinstance(value, float) and pd.isna(value)):
+            values.append("")
+        else:
+            values.append(float(value) if name in NUMERIC_FIELDS else str(value))
+    return tuple(values)
+
+
+def iter_fingerprints(catalog_file, chunksize=DIFF_CHUNK_SIZE):
+    """(id, fingerprint) of every row of a catalog CSV, read in chunks so memory doesn't grow with the file."""
+    if not os.path.exists(catalog_file) or os.path.getsize(catalog_file) == 0:
+        return
+    # Text columns are read as text in every chunk, so an all-digit value can't change type between chunks
+    dtype = {name: str for name in ("id",) + COMPARED_FIELDS if name not in NUMERIC_FIELDS}
+    for chunk in pd.read_csv(catalog_file, dtype=dtype, chunksize=chunksize):
+        for row in chunk.to_dict("records"):
+            yield str(row["id"]), fingerprint(row)
+
+
+def diff_catalog_files(old_file, new_file, chunksize=DIFF_CHUNK_SIZE):
+    """Diff two catalog CSVs keeping only one compact digest per previous book in memory."""
+    old = {book_id: _digest(values) for book_id, values in iter_fingerprints(old_file, chunksize)}
+    diff = CatalogDiff()
+    for book_id, values in iter_fingerprints(new_file, chunksize):
+        previous = old.pop(book_id, None)
+        if previous is None:
+            diff.added.append(book_id)
+        elif previous != _digest(values):
+            diff.changed.append(book_id)
+    diff.removed = list(old)
+    return diff
+
+
+def _digest(values):
+    return hashlib.blake2b(json.dumps(values).encode("utf-8"), digest_size=16).digest()
+
+
+def read_manifest(catalog_file):
+    manifest_file = _sidecar(catalog_file, MANIFEST_FILE_NAME)
+    if not os.path.exists(manifest_file):
+        return {"version": 0}
+    with open(manifest_file, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def record_version(catalog_file, diff, total_books):
+    """Bump the catalog version, append the diff to the changelog and return the new version."""
+    version = read_manifest(catalog_file).get("version", 0) + 1
+    timestamp = datetime.now().isoformat()
+
+    with open(_sidecar(catalog_file, CHANGELOG_FILE_NAME), "a", encoding="utf-8") as f:
+        f.write(json.dumps({
+            "version": version,
+            "timestamp": timestamp,
+            "added": diff.added,
+            "removed": diff.removed,
+            "changed": diff.changed
+        }) + "\n")
+
+    manifest_file = _sidecar(catalog_file, MANIFEST_FILE_NAME)
+    tmp_file = f"{manifest_file}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump({"version": version, "updated_at": timestamp, "total_books": total_books, **diff.summary()}, f)
+    os.replace(tmp_file, manifest_file)
+    return version
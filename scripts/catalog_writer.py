@@ -0,0 +1,123 @@
+import json
+import os
+
+import pandas as pd
+
+PARTIAL_SUFFIX = ".partial"
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+DEFAULT_BATCH_SIZE = 500
+
+
+class CatalogWriter:
+    """Streams scraped books to a partial CSV in batches, checkpointing the pages already on disk so an interrupted scrape can resume."""
+
+    def __init__(self, output_file, source, batch_size=DEFAULT_BATCH_SIZE, resume=False, on_page=None, columns=None, dtypes=None):
+        self.output_file = output_file
+        self.partial_file = output_file + PARTIAL_SUFFIX
+        self.checkpoint_file = output_file + CHECKPOINT_SUFFIX
+        self.source = source
+        self.batch_size = batch_size
+        self.on_page = on_page
+        self.pending = []
+        self.pending_pages = []
+        self.pending_categories = []
+        self.pages = set()
+        self.categories = set()
+        self.columns = list(columns) if columns else None
+        self.dtypes = dtypes
+        self.rows = 0
+        self.offset = 0
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+
+        checkpoint = self._load_checkpoint() if resume else None
+        if checkpoint is not None:
+            self.pages = set(checkpoint["pages"])
+            self.categories = set(checkpoint["categories"])
+            self.columns = checkpoint["columns"] or self.columns
+            self.rows = checkpoint["rows"]
+            self.offset = checkpoint["offset"]
+            # Rows appended after the last checkpoint belong to pages that will be scraped again
+            with open(self.partial_file, "r+b") as f:
+                f.truncate(self.offset)
+            print(f"⏯️  Retomando scraping: {len(self.pages)} páginas e {self.rows} livros já gravados")
+        else:
+            open(self.partial_file, "wb").close()
+            if os.path.exists(self.checkpoint_file):
+                os.remove(self.checkpoint_file)
+
+    def _load_checkpoint(self):
+        if not (os.path.exists(self.checkpoint_file) and os.path.exists(self.partial_file)):
+            return None
+        with open(self.checkpoint_file, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        # A checkpoint of another site or with other columns, or ahead of what reached the disk, can't be resumed safely
+        if checkpoint.get("source") != self.source or os.path.getsize(self.partial_file) < checkpoint["offset"]:
+            return None
+        if self.columns is not None and checkpoint["columns"] not in (None, self.columns):
+            return None
+        return checkpoint
+
+    def page_done(self, url):
+        return url in self.pages
+
+    def category_done(self, url):
+        return url in self.categories
+
+    def add_page(self, url, books):
+        self.pending.extend(books)
+        self.pending_pages.append(url)
+        if self.on_page is not None:
+            self.on_page(len(books))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def complete_category(self, url):
+        self.pending_categories.append(url)
+
+    def flush(self):
+        """Append pending rows to the partial CSV, sync it and only then checkpoint their pages."""
+        if self.pending:
+            self.columns = self.columns or list(self.pending[0].keys())
+            with open(self.partial_file, "a", encoding="utf-8", newline="") as f:
+                df = pd.DataFrame(self.pending, columns=self.columns)
+                if self.dtypes:
+                    df = df.astype(self.dtypes)
+                df.to_csv(f, header=self.offset == 0, index=False)
+                f.flush()
+                os.fsync(f.fileno())
+                self.offset = f.tell()
+            self.rows += len(self.pending)
+            self.pending = []
+        if not (self.pending_pages or self.pending_categories):
+            return
+
+        self.pages.update(self.pending_pages)
+        self.categories.update(self.pending_categories)
+        self.pending_pages = []
+        self.pending_categories = []
+        tmp_file = f"{self.checkpoint_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump({
+                "source": self.source,
+                "columns": self.columns,
+                "rows": self.rows,
+                "offset": self.offset,
+                "pages": sorted(self.pages),
+                "categories": sorted(self.categories)
+            }, f)
+        os.replace(tmp_file, self.checkpoint_file)
+
+    def finish(self, publish=True):
+        """Atomically replace the catalog with the partial CSV (or discard it) and drop the checkpoint."""
+        self.flush()
+        if publish and self.rows == 0:
+            # An empty partial has no header either, so publishing it would leave the API with an unreadable catalog
+            self.finish(publish=False)
+            raise RuntimeError(f"Nenhum livro foi coletado; {self.output_file} não foi alterado")
+        if publish:
+            os.replace(self.partial_file, self.output_file)
+            print(f"✅ {self.rows} livros salvos em {self.output_file}")
+        else:
+            os.remove(self.partial_file)
+        if os.path.exists(self.checkpoint_file):
+            os.remove(self.checkpoint_file)
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
+
+from scripts.catalog_diff import DETAIL_FIELDS, LISTING_FIELDS, fingerprint
+from scripts.scrape_books import HTML_PARSER
+from scripts.scrape_state import content_hash
+
+CACHE_FILE_NAME = "detail_cache.json"
+DETAIL_PAGE_STRAINER = SoupStrainer("article", class_="product_page")
+MORE_MARKER = "...more"
+
+
+def parse_stock(availability):
+    """Units in stock from 'In stock (22 available)'; 0 when out of stock, None when no count is shown."""
+    match = re.search(r"(\d+)\s+available", availability or "")
+    if match:
+        return int(match.group(1))
+    return 0 if availability is not None and "out of stock" in availability.lower() else None
+
+
+def _detail_texts_soup(html):
+    soup = BeautifulSoup(html, "html.parser", parse_only=DETAIL_PAGE_STRAINER)
+    upc = next((row.td.text for row in soup.find_all("tr") if row.th is not None and row.th.text.strip() == "UPC" and row.td is not None), None)
+    heading = soup.find(id="product_description")
+    description = heading.find_next_sibling("p") if heading is not None else None
+    availability = soup.select_one(".product_main .availability")
+    return upc, description.text if description is not None else None, availability.text if availability is not None else None
+
+
+def parse_detail_page(html):
+    """UPC, description and stock count of a product page."""
+    if HTML_PARSER == "lxml":
+        from scripts.fast_parser import parse_detail_page as detail_texts_lxml
+        upc, description, availability = detail_texts_lxml(html)
+    else:
+        upc, description, availability = _detail_texts_soup(html)
+    description = description.strip() if description is not None else None
+    # Long descriptions are cut on the page and end with the text of a "...more" link
+    if description is not None and description.endswith(MORE_MARKER):
+        description = description[:-len(MORE_MARKER)].rstrip()
+    return {
+        "upc": upc.strip() if upc is not None else None,
+        "description": description or None,
+        "stock": parse_stock(availability)
+    }
+
+
+def _listing_hash(book):
+    return content_hash(json.dumps(fingerprint(book, LISTING_FIELDS)).encode("utf-8"))
+
+
+class DetailEnricher:
+    """Adds UPC, description and stock count from each book's detail page; books whose listing is unchanged are not fetched again."""
+
+    def __init__(self, catalog_file, concurrency=4, cache_file=None):
+        self.cache_file = cache_file or os.path.join(os.path.dirname(catalog_file) or ".", CACHE_FILE_NAME)
+        self.concurrency = concurrency
+        self.entries = {}
+        if os.path.exists(self.cache_file):
+            with open(self.cache_file, encoding="utf-8") as f:
+                self.entries = json.load(f)
+        self.seen = {}
+        self._slots = None
+        self.reused = 0
+        self.not_modified = 0
+        self.unchanged = 0
+        self.parsed = 0
+        self.failed = 0
+
+    def _cached(self, book):
+        entry = self.entries.get(book["id"])
+        if entry is None or entry["listing"] != _listing_hash(book):
+            return None
+        self.reused += 1
+        self.seen[book["id"]] = entry
+        return entry["detail"]
+
+    def _request_headers(self, book):
+        entry = self.entries.get(book["id"])
+        headers = {}
+        if entry is not None and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry is not None and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def _apply(self, book, response):
+        """Detail fields from a fetched page, reusing the previous parse on 304 or identical bytes; None on failure."""
+        entry = self.entries.get(book["id"])
+        status_code = response.status_code if response is not None else None
+        if status_code == 304 and entry is not None:
+            self.not_modified += 1
+            detail, digest, headers = entry["detail"], entry["hash"], {"ETag": entry.get("etag"), "Last-Modified": entry.get("last_modified")}
+        elif status_code == 200:
+            digest, headers = content_hash(response.content), response.headers
+            if entry is not None and entry["hash"] == digest:
+                self.unchanged += 1
+                detail = entry["detail"]
+            else:
+                self.parsed += 1
+                detail = parse_detail_page(response.content)
+        else:
+            self.failed += 1
+            # A stale detail beats an empty one; the entry stays keyed to the old listing so it is fetched again next run
+            if entry is not None:
+                self.seen[book["id"]] = entry
+                return entry["detail"]
+            return None
+
+        self.seen[book["id"]] = {
+            "listing": _listing_hash(book),
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "hash": digest,
+            "detail": detail
+        }
+        return detail
+
+    @staticmethod
+    def _merge(book, detail):
+        return {**book, **(detail if detail is not None else dict.fromkeys(DETAIL_FIELDS))}
+
+    def _split(self, books):
+        details = {}
+        for book in books:
+            detail = self._cached(book)
+            if detail is not None:
+                details[book["id"]] = detail
+        return details, [book for book in books if book["id"] not in details and book.get("url")]
+
+    def enrich(self, books):
+        """Serial scrape: fetch the missing details with at most `concurrency` requests in flight."""
+        details, to_fetch = self._split(books)
+
+        def fetch(book):
+            try:
+                return requests.get(book["url"], headers=self._request_headers(book), timeout=30)
+            except requests.RequestException as error:
+                print(f"⚠️  {book['url']}: {error}")
+                return None
+
+        with ThreadPoolExecutor(self.concurrency) as pool:
+            for book, response in zip(to_fetch, pool.map(fetch, to_fetch)):
+                details[book["id"]] = self._apply(book, response)
+        return [self._merge(book, details.get(book["id"])) for book in books]
+
+    async def enrich_async(self, fetcher, books):
+        """Async scrape: fetch the missing details through the shared fetcher, bounded across all categories."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.concurrency)
+        details, to_fetch = self._split(books)
+
+        async def fetch(book):
+            async with self._slots:
+                return await fetcher.get(book["url"], headers=self._request_headers(book))
+
+        for book, response in zip(to_fetch, await asyncio.gather(*(fetch(book) for book in to_fetch))):
+            details[book["id"]] = self._apply(book, response)
+        return [self._merge(book, details.get(book["id"])) for book in books]
+
+    def save(self):
+        # Only books seen in this run are kept, so books removed from the site are forgotten
+        tmp_file = f"{self.cache_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(self.seen, f)
+        os.replace(tmp_file, self.cache_file)
+        print(f"🔎 Detalhes: {self.reused} reaproveitados, {self.not_modified} não modificados, "
+              f"{self.unchanged} com conteúdo idêntico, {self.parsed} processados, {self.failed} falhas")
@@ -0,0 +1,71 @@
+"""
+Parsing das páginas do scraper direto com lxml e XPath pré-compilados.
+Produz exatamente os mesmos dicionários que extract_book_data, sem montar a árvore do BeautifulSoup.
+"""
+
+import lxml.html
+from bs4 import UnicodeDammit
+from lxml import etree
+
+from scripts.scrape_books import book_id, parse_price, product_path, rating_to_int
+
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Same semantics as the CSS selectors used with BeautifulSoup: class tokens, descendants, document order
+_ARTICLES = etree.XPath(f"//article[{_has_class('product_pod')}]")
+_PRICE = etree.XPath(f".//*[{_has_class('price_color')}]")
+_AVAILABILITY = etree.XPath(f".//*[{_has_class('availability')}]")
+_CURRENT_PAGE = etree.XPath(f"//ul[{_has_class('pager')}]//li[{_has_class('current')}]")
+_CATEGORY_LINKS = etree.XPath(f"//*[{_has_class('side_categories')}]//ul//li//ul//li//a")
+_DETAIL_UPC = etree.XPath("//table//tr[normalize-space(th) = 'UPC']/td")
+_DETAIL_DESCRIPTION = etree.XPath("//*[@id = 'product_description']/following-sibling::p[1]")
+_DETAIL_AVAILABILITY = etree.XPath(f"//*[{_has_class('product_main')}]//*[{_has_class('availability')}]")
+
+
+def _document(html):
+    # Decoded the way BeautifulSoup does (declared charset, then UTF-8 guesses) so both paths see the same text
+    if isinstance(html, bytes):
+        html = UnicodeDammit(html, is_html=True).unicode_markup
+    return lxml.html.fromstring(html)
+
+
+def _book(article, category, base_url):
+    link = article.find(".//h3").find(".//a")
+    return {
+        "id": book_id(link.get("href")),
+        "title": link.get("title"),
+        "price": parse_price(_PRICE(article)[0].text_content()),
+        "rating": rating_to_int(article.find(".//p").get("class").split()[1]),
+        "availability": _AVAILABILITY(article)[0].text_content().strip(),
+        "category": category,
+        "image": base_url + article.find(".//img").get("src").replace("../", ""),
+        "url": base_url + product_path(link.get("href"))
+    }
+
+
+def parse_category_page(html, category, base_url):
+    document = _document(html)
+    books = [_book(article, category, base_url) for article in _ARTICLES(document)]
+    current = _CURRENT_PAGE(document)
+    try:
+        page_count = int(current[0].text_content().split()[-1]) if current else 1
+    except ValueError:
+        page_count = 1
+    return books, page_count
+
+
+def parse_categories(html):
+    return {str(link.get("href")): link.text_content().strip() for link in _CATEGORY_LINKS(_document(html))}
+
+
+def _first_text(matches):
+    return matches[0].text_content() if matches else None
+
+
+def parse_detail_page(html):
+    """Raw UPC, description and availability texts of a product page (None when absent)."""
+    document = _document(html)
+    return _first_text(_DETAIL_UPC(document)), _first_text(_DETAIL_DESCRIPTION(document)), _first_text(_DETAIL_AVAILABILITY(document))
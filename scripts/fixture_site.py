@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Site de fixtures para o scraper: grava o books.toscrape.com em disco, gera um corpus sintético com a mesma
+marcação e serve qualquer um dos dois localmente com latência e erros configuráveis.
+"""
+
+import argparse
+import hashlib
+import html
+import os
+import random
+import shutil
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urljoin
+
+import requests
+
+from scripts.scrape_books import BASE_URL, category_page_url, parse_categories, parse_category_page
+
+CORPUS_DIR = os.path.join("scripts", "fixtures", "site")
+BOOKS_PER_PAGE = 20
+CATEGORY_NAMES = (
+    "Travel", "Mystery", "Historical Fiction", "Sequential Art", "Classics", "Philosophy", "Romance",
+    "Womens Fiction", "Fiction", "Childrens", "Religion", "Nonfiction", "Music", "Default", "Science Fiction",
+    "Sports and Games", "Add a comment", "Fantasy", "New Adult", "Young Adult", "Science", "Poetry", "Paranormal",
+    "Art", "Psychology", "Autobiography", "Parenting", "Adult Fiction", "Humor", "Horror", "History",
+    "Food and Drink", "Christian Fiction", "Business", "Biography", "Thriller", "Contemporary", "Spirituality",
+    "Academic", "Self Help", "Historical", "Christian", "Suspense", "Short Stories", "Novels", "Health",
+    "Politics", "Cultural", "Erotica", "Crime"
+)
+# Accents, quotes and ampersands exercise decoding and entity handling like the real catalog does
+TITLE_WORDS = (
+    "Light", "Night", "House", "City", "Garden", "Queen", "King", "Silent", "Dragon", "Star", "Sea", "Love",
+    "Café", "Naïve", "Señor", "Über", "Rock & Roll", "\"Quoted\"", "L'Amour"
+)
+RATINGS = ("One", "Two", "Three", "Four", "Five")
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en-us" class="no-js">
+<head><title>Books to Scrape</title><meta http-equiv="content-type" content="text/html; charset=UTF-8" /><meta name="viewport" content="width=device-width"/><link rel="stylesheet" href="{root}static/css/styles.css" /></head><body id="default" class="default"><header class="header container-fluid"><div class="page_inner"><div class="row"><div class="col-sm-8 h1"><a href="{root}index.html">Books to Scrape</a><small> We love being scraped!</small></div></div></div></header><div class="container-fluid page"><div class="page_inner"><ul class="breadcrumb"><li><a href="{root}index.html">Home</a></li><li class="active">{heading}</li></ul><div class="row"><aside class="sidebar col-sm-4 col-md-3"><div class="side_categories"><ul class="nav nav-list"><li><a href="{root}catalogue/category/books_1/index.html">Books</a><ul>
+{sidebar}
+</ul></li></ul></div></aside><div class="col-sm-8 col-md-9"><div class="page-header action"><h1>{heading}</h1></div><form method="get" class="form-horizontal"><strong>{total}</strong> results.</form><section><div><ol class="row">
+{products}</ol>{pager}</div></section></div></div></div></div><footer class="footer container-fluid"></footer><script src="{root}static/js/jquery.js" type="text/javascript"></script></body></html>
+"""
+
+SIDEBAR_TEMPLATE = """<li>
+<a href="{root}{url}">
+                                {name}
+                        </a>
+</li>"""
+
+PRODUCT_TEMPLATE = """<li class="col-xs-6 col-sm-4 col-md-3 col-lg-3">
+    <article class="product_pod">
+            <div class="image_container">
+                    <a href="{href}"><img src="{image}" alt="{title}" class="thumbnail"></a>
+            </div>
+                <p class="star-rating {rating}">
+                    <i class="icon-star"></i><i class="icon-star"></i><i class="icon-star"></i><i class="icon-star"></i><i class="icon-star"></i>
+                </p>
+            <h3><a href="{href}" title="{title}">{short_title}</a></h3>
+            <div class="product_price">
+        <p class="price_color">£{price:.2f}</p>
+<p class="{stock_class} availability">
+    <i class="{stock_icon}"></i>
+        {availability}
+</p>
+    <form><button type="submit" class="btn btn-primary btn-block" data-loading-text="Adding...">Add to basket</button></form>
+            </div>
+    </article>
+</li>
+"""
+
+DETAIL_TEMPLATE = """<!DOCTYPE html>
+<html lang="en-us" class="no-js">
+<head><title>{title} | Books to Scrape - Sandbox</title><meta http-equiv="content-type" content="text/html; charset=UTF-8" /><link rel="stylesheet" href="../../static/css/styles.css" /></head><body id="default" class="default"><header class="header container-fluid"><div class="page_inner"><div class="row"><div class="col-sm-8 h1"><a href="../../index.html">Books to Scrape</a></div></div></div></header><div class="container-fluid page"><div class="page_inner"><ul class="breadcrumb"><li><a href="../../index.html">Home</a></li><li class="active">{title}</li></ul><div class="content"><div id="content_inner">
+<article class="product_page"><!-- Start of product page -->
+    <div class="row">
+        <div class="col-sm-6"><div id="product_gallery" class="carousel"><div class="thumbnail"><div class="carousel-inner"><div class="item active"><img src="{image}" alt="{title}" /></div></div></div></div></div>
+        <div class="col-sm-6 product_main">
+    <h1>{title}</h1>
+    <p class="price_color">£{price:.2f}</p>
+<p class="{stock_class} availability">
+    <i class="{stock_icon}"></i>
+        {stock_text}
+</p>
+    <p class="star-rating {rating}"><i class="icon-star"></i><i class="icon-star"></i><i class="icon-star"></i><i class="icon-star"></i><i class="icon-star"></i></p>
+        </div>
+    </div>
+{description}
+    <div class="sub-header"><h2>Product Information</h2></div>
+<table class="table table-striped">
+        <tr><th>UPC</th><td>{upc}</td></tr>
+        <tr><th>Product Type</th><td>Books</td></tr>
+        <tr><th>Price (excl. tax)</th><td>£{price:.2f}</td></tr>
+        <tr><th>Price (incl. tax)</th><td>£{price:.2f}</td></tr>
+        <tr><th>Tax</th><td>£0.00</td></tr>
+        <tr><th>Availability</th><td>{stock_text}</td></tr>
+        <tr><th>Number of reviews</th><td>0</td></tr>
+</table>
+</article><!-- End of product page -->
+</div></div></div></div><footer class="footer container-fluid"></footer></body></html>
+"""
+
+DESCRIPTION_TEMPLATE = """    <div id="product_description" class="sub-header"><h2>Product Description</h2></div>
+    <p>{description} ...more</p>"""
+
+PAGER_TEMPLATE = """<div><ul class="pager">{previous}<li class="current">
+            Page {page} of {pages}
+            </li>{next}</ul></div>"""
+
+
+def _write(output_dir, rel_path, content):
+    path = os.path.join(output_dir, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+def corpus_digest(corpus_dir=CORPUS_DIR):
+    """SHA-256 over the relative path and bytes of every file, to tell whether two corpora are identical."""
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(corpus_dir):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            digest.update(os.path.relpath(path, corpus_dir).replace(os.sep, "/").encode("utf-8") + b"\0")
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def record(base_url=BASE_URL, output_dir=CORPUS_DIR, details=False):
+    """Save the index and every category page of a live site (and each book's page, with details) under output_dir."""
+    base_url = base_url.rstrip("/") + "/"
+    session = requests.Session()
+
+    def fetch(url):
+        res = session.get(url)
+        if res.status_code == 200:
+            _write(output_dir, url[len(base_url):], res.content)
+        return res
+
+    index = fetch(urljoin(base_url, "index.html"))
+    index.raise_for_status()
+    pages = 1
+    for rel_url, category_name in parse_categories(index.content).items():
+        page = 1
+        while True:
+            res = fetch(category_page_url(rel_url, page, base_url))
+            if res.status_code != 200:
+                break
+            pages += 1
+            books, page_count = parse_category_page(res.content, category_name, base_url)
+            if details:
+                for book in books:
+                    pages += fetch(book["url"]).status_code == 200
+                    time.sleep(0.2)
+            if not books or page >= page_count:
+                break
+            page += 1
+            time.sleep(0.2)
+    print(f"✅ {pages} páginas gravadas em {output_dir} (sha256 {corpus_digest(output_dir)})")
+
+
+def _synthetic_books(rng, total, categories):
+    books = []
+    for number in range(1, total + 1):
+        title = " ".join(rng.choice(TITLE_WORDS) for _ in range(rng.randint(2, 5))) + f" {number}"
+        in_stock = rng.random() < 0.9
+        stock = rng.randint(1, 22) if in_stock else 0
+        books.append({
+            "number": number,
+            "slug": f"book-{number}_{number}",
+            "title": title,
+            # Every category gets at least one book, like on the real site
+            "category": categories[number - 1] if number <= len(categories) else rng.choice(categories),
+            "price": round(rng.uniform(10, 60), 2),
+            "rating": rng.choice(RATINGS),
+            "availability": "In stock" if in_stock else "Out of stock",
+            "stock_class": "instock" if in_stock else "outofstock",
+            "stock_icon": "icon-ok" if in_stock else "icon-remove",
+            "stock_text": f"In stock ({stock} available)" if in_stock else "Out of stock",
+            "upc": "%016x" % rng.getrandbits(64),
+            # A few books have no description block at all, as on the real site
+            "description": " ".join(rng.choice(TITLE_WORDS).lower() for _ in range(rng.randint(20, 60))) if rng.random() < 0.95 else None
+        })
+    return books
+
+
+def _sidebar(categories, root):
+    return "\n".join(SIDEBAR_TEMPLATE.format(root=root, url=url, name=html.escape(name)) for url, name in categories)
+
+
+def _product(book, root, catalogue):
+    title = html.escape(book["title"])
+    return PRODUCT_TEMPLATE.format(
+        href=f"{catalogue}{book['slug']}/index.html",
+        image=f"{root}media/cache/{book['number'] % 100:02d}/{book['number']:04d}/img{book['number']}.jpg",
+        title=title,
+        short_title=html.escape(book["title"][:20] + ("..." if len(book["title"]) > 20 else "")),
+        rating=book["rating"],
+        price=book["price"],
+        stock_class=book["stock_class"],
+        stock_icon=book["stock_icon"],
+        availability=book["availability"]
+    )
+
+
+def _detail(book):
+    description = DESCRIPTION_TEMPLATE.format(description=html.escape(book["description"])) if book["description"] else ""
+    return DETAIL_TEMPLATE.format(
+        title=html.escape(book["title"]),
+        image=f"../../media/cache/{book['number'] % 100:02d}/{book['number']:04d}/img{book['number']}.jpg",
+        price=book["price"],
+        stock_class=book["stock_class"],
+        stock_icon=book["stock_icon"],
+        stock_text=book["stock_text"],
+        rating=book["rating"],
+        description=description,
+        upc=book["upc"]
+    )
+
+
+def _pager(page, pages):
+    if pages == 1:
+        return ""
+    previous = f'<li class="previous"><a href="{"index.html" if page == 2 else f"page-{page - 1}.html"}">previous</a></li>' if page > 1 else ""
+    following = f'<li class="next"><a href="page-{page + 1}.html">next</a></li>' if page < pages else ""
+    return PAGER_TEMPLATE.format(previous=previous, page=page, pages=pages, next=following)
+
+
+def generate(output_dir=CORPUS_DIR, total_books=1000, category_count=len(CATEGORY_NAMES), seed=42):
+    """Write a deterministic synthetic copy of the site with the same markup the scraper reads."""
+    # Pages left over from a larger or recorded corpus would change what the benchmarks read, so start clean
+    shutil.rmtree(os.path.join(output_dir, "catalogue"), ignore_errors=True)
+    if os.path.exists(os.path.join(output_dir, "index.html")):
+        os.remove(os.path.join(output_dir, "index.html"))
+    rng = random.Random(seed)
+    names = CATEGORY_NAMES[:category_count]
+    categories = [
+        (f"catalogue/category/books/{name.lower().replace(' ', '-')}_{position}/index.html", name)
+        for position, name in enumerate(names, start=2)
+    ]
+    books = _synthetic_books(rng, total_books, names)
+
+    _write(output_dir, "index.html", PAGE_TEMPLATE.format(
+        root="", heading="All products", sidebar=_sidebar(categories, ""), total=len(books),
+        products="".join(_product(book, "", "catalogue/") for book in books[:BOOKS_PER_PAGE]),
+        pager=_pager(1, -(-len(books) // BOOKS_PER_PAGE))
+    ).encode("utf-8"))
+
+    pages = 1
+    root = "../../../../"
+    for url, name in categories:
+        category_books = [book for book in books if book["category"] == name]
+        page_count = max(1, -(-len(category_books) // BOOKS_PER_PAGE))
+        for page in range(1, page_count + 1):
+            chunk = category_books[(page - 1) * BOOKS_PER_PAGE:page * BOOKS_PER_PAGE]
+            _write(output_dir, url if page == 1 else url.replace("index.html", f"page-{page}.html"), PAGE_TEMPLATE.format(
+                root=root, heading=html.escape(name), sidebar=_sidebar(categories, root), total=len(category_books),
+                products="".join(_product(book, root, "../../../") for book in chunk), pager=_pager(page, page_count)
+            ).encode("utf-8"))
+            pages += 1
+    for book in books:
+        _write(output_dir, f"catalogue/{book['slug']}/index.html", _detail(book).encode("utf-8"))
+    print(f"✅ {pages} páginas de listagem, {len(books)} páginas de livros gerados em {output_dir} (sha256 {corpus_digest(output_dir)})")
+
+
+class FixtureRequestHandler(SimpleHTTPRequestHandler):
+    """Serves the corpus with the server's configured latency and error rate; Last-Modified/304 come from the base class."""
+
+    def do_GET(self):
+        server = self.server
+        delay = server.latency + (server.rng.uniform(0, server.jitter) if server.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        failed = bool(server.error_rate) and server.rng.random() < server.error_rate
+        with server.counters_lock:
+            server.requests += 1
+            server.errors += failed
+        if failed:
+            self.send_error(server.error_status)
+            return
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(corpus_dir=CORPUS_DIR, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503, seed=None):
+    """Serve corpus_dir from a background thread; the site root is server.base_url."""
+    if not os.path.exists(os.path.join(corpus_dir, "index.html")):
+        raise FileNotFoundError(f"Corpus não encontrado em {corpus_dir}; rode 'python -m scripts.fixture_site generate' ou 'record'")
+    server = ThreadingHTTPServer((host, port), partial(FixtureRequestHandler, directory=corpus_dir))
+    server.daemon_threads = True
+    server.latency = latency
+    server.jitter = jitter
+    server.error_rate = error_rate
+    server.error_status = error_status
+    server.rng = random.Random(seed)
+    server.counters_lock = threading.Lock()
+    server.requests = 0
+    server.errors = 0
+    server.base_url = f"http://{server.server_address[0]}:{server.server_address[1]}/"
+    threading.Thread(target=server.serve_forever, name="fixture-site", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grava, gera e serve o site de fixtures do scraper")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="Grava o site real em disco")
+    record_parser.add_argument("--base-url", default=BASE_URL)
+    record_parser.add_argument("--output", default=CORPUS_DIR)
+    record_parser.add_argument("--details", action="store_true", help="Grava também a página de cada livro")
+
+    generate_parser = commands.add_parser("generate", help="Gera um corpus sintético com a mesma marcação do site")
+    generate_parser.add_argument("--output", default=CORPUS_DIR)
+    generate_parser.add_argument("--books", type=int, default=1000)
+    generate_parser.add_argument("--categories", type=int, default=len(CATEGORY_NAMES), choices=range(1, len(CATEGORY_NAMES) + 1), metavar="N")
+    generate_parser.add_argument("--seed", type=int, default=42)
+
+    serve_parser = commands.add_parser("serve", help="Serve o corpus localmente")
+    serve_parser.add_argument("--corpus", default=CORPUS_DIR)
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument("--latency", type=float, default=0.0, help="Atraso fixo por requisição, em segundos")
+    serve_parser.add_argument("--jitter", type=float, default=0.0, help="Atraso aleatório extra de até N segundos")
+    serve_parser.add_argument("--error-rate", type=float, default=0.0, help="Fração das requisições respondidas com erro")
+    serve_parser.add_argument("--error-status", type=int, default=503)
+    serve_parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.base_url, args.output, args.details)
+    elif args.command == "generate":
+        generate(args.output, args.books, args.categories, args.seed)
+    else:
+        server = start_server(args.corpus, args.host, args.port, args.latency, args.jitter, args.error_rate, args.error_status, args.seed)
+        print(f"🌐 Servindo {args.corpus} em {server.base_url} (Ctrl+C para parar)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
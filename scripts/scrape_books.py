@@ -1,75 +1,263 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-import time
+import argparse
+import importlib.util
 import os
+import random
+import re
+import time
 import uuid
+from urllib.parse import urljoin
 
-BASE_URL = "https://books.toscrape.com/catalogue/page-{}.html"
-IMAGE_PREFIX = "https://books.toscrape.com/"
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
+
+from scripts.catalog_diff import DETAIL_FIELDS, diff_catalog_files, read_manifest, record_version
+from scripts.catalog_writer import DEFAULT_BATCH_SIZE, CatalogWriter
+from scripts.scrape_state import ScrapeState
+
+BASE_URL = os.getenv("SCRAPER_BASE_URL", "https://books.toscrape.com/")
 OUTPUT_FILE = "data/books.csv"
+SERIAL_DELAY = 0.2
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+REQUEST_TIMEOUT = 30.0
+BOOK_COLUMNS = ("id", "title", "price", "rating", "availability", "category", "image", "url")
+
+# With lxml installed pages are read through XPath (scripts/fast_parser.py); otherwise BeautifulSoup only
+# builds the product cards, the pager and the category sidebar, which are all the scraper ever reads
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+CATEGORY_PAGE_STRAINER = SoupStrainer(["article", "ul"], class_=["product_pod", "pager"])
+CATEGORIES_STRAINER = SoupStrainer("div", class_="side_categories")
 
 def rating_to_int(rating_str):
     mapping = {"One": 1, "Two": 2, "Three": 3, "Four": 4, "Five": 5}
     return mapping.get(rating_str, 0)
 
-def extract_book_data(article, category="Unknown"):
+def parse_price(price_str):
+    # Strips the currency symbol whatever encoding the page was decoded with
+    return float(re.sub(r"[^\d.]", "", price_str))
+
+def product_path(product_href):
+    return "catalogue/" + product_href.replace("../", "").replace("catalogue/", "")
+
+def book_id(product_href):
+    # Derived from the product page path, so the same book keeps its id across scrapes and mirrors of the site
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, product_path(product_href)))
+
+def extract_book_data(article, category="Unknown", base_url=BASE_URL):
     title = article.h3.a["title"]
-    price = float(article.select_one(".price_color").text[2:])
+    # find(class_=...) matches the same first descendant as select_one(".class") without the CSS engine overhead
+    price = parse_price(article.find(class_="price_color").text)
     rating = rating_to_int(article.p["class"][1])
-    availability = article.select_one(".availability").text.strip()
-    img_url = IMAGE_PREFIX + article.img["src"].replace("../", "")
+    availability = article.find(class_="availability").text.strip()
+    img_url = base_url + article.img["src"].replace("../", "")
     return {
-        "id": str(uuid.uuid4()),
+        "id": book_id(article.h3.a["href"]),
         "title": title,
         "price": price,
         "rating": rating,
         "availability": availability,
         "category": category,
-        "image": img_url
+        "image": img_url,
+        "url": base_url + product_path(article.h3.a["href"])
     }
 
-def get_categories():
-    url = "https://books.toscrape.com/index.html"
-    res = requests.get(url)
-    soup = BeautifulSoup(res.text, "html.parser")
+def category_page_url(rel_url, page, base_url=BASE_URL):
+    if page == 1:
+        return urljoin(base_url, rel_url)
+    return urljoin(base_url, rel_url.replace("index.html", f"page-{page}.html"))
+
+def parse_categories_soup(html):
+    soup = BeautifulSoup(html, "html.parser", parse_only=CATEGORIES_STRAINER)
     category_links = soup.select(".side_categories ul li ul li a")
-    categories = {str(link["href"]): link.text.strip() for link in category_links}
+    return {str(link["href"]): link.text.strip() for link in category_links}
+
+def parse_category_page_soup(html, category, base_url=BASE_URL):
+    soup = BeautifulSoup(html, "html.parser", parse_only=CATEGORY_PAGE_STRAINER)
+    books = [extract_book_data(article, category=category, base_url=base_url) for article in soup.find_all("article", class_="product_pod")]
+    current = soup.select_one("ul.pager li.current")
+    try:
+        page_count = int(current.text.split()[-1]) if current is not None else 1
+    except ValueError:
+        page_count = 1
+    return books, page_count
+
+def parse_categories(html):
+    if HTML_PARSER == "lxml":
+        from scripts.fast_parser import parse_categories as parse_categories_lxml
+        return parse_categories_lxml(html)
+    return parse_categories_soup(html)
+
+def parse_category_page(html, category, base_url=BASE_URL):
+    """Books of a category page and its page count, read from the 'Page 1 of N' pager (1 when absent)."""
+    if HTML_PARSER == "lxml":
+        from scripts.fast_parser import parse_category_page as parse_category_page_lxml
+        return parse_category_page_lxml(html, category, base_url)
+    return parse_category_page_soup(html, category, base_url)
+
+def process_index_page(url, response, state=None):
+    """Categories of the index page, reused from the previous scrape when the page is unchanged."""
+    if state is not None:
+        data = state.reuse(url, response.status_code, response.content)
+        if data is not None:
+            return data["categories"]
+    categories = parse_categories(response.content)
+    if state is not None:
+        state.remember(url, response.headers, response.content, {"categories": categories})
     return categories
 
-def scrape() -> str:
-    books = []
-    categories = get_categories()
+def parse_category_pages(pages):
+    """(books, page_count) of each (html, category, base_url) in a batch; the unit of work of parse workers."""
+    return [parse_category_page(html, category, base_url) for html, category, base_url in pages]
+
+def reuse_category_page(url, response, state=None):
+    """Books and page count from the previous scrape when the page is unchanged; None when it must be parsed."""
+    if state is None:
+        return None
+    data = state.reuse(url, response.status_code, response.content)
+    if data is None:
+        return None
+    return state.books(data), data["page_count"]
+
+def remember_category_page(url, response, books, page_count, state=None):
+    if state is not None:
+        state.remember(url, response.headers, response.content, {"ids": [book["id"] for book in books], "page_count": page_count})
+
+def process_category_page(url, response, category, base_url=BASE_URL, state=None):
+    """Books and page count of a category page, reused from the previous scrape when the page is unchanged."""
+    reused = reuse_category_page(url, response, state)
+    if reused is not None:
+        return reused
+    books, page_count = parse_category_page(response.content, category, base_url)
+    remember_category_page(url, response, books, page_count, state)
+    return books, page_count
+
+def retry_delay(attempt, backoff, response=None):
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    # Exponential backoff with jitter so retries from concurrent tasks don't line up
+    return backoff * (2 ** attempt) * (0.5 + random.random())
+
+def fetch_page(url, state=None, retries=3, backoff=0.5):
+    """GET a page, retrying transport errors and retryable statuses; returns the last response or None."""
+    response = None
+    for attempt in range(retries + 1):
+        try:
+            response = requests.get(url, headers=state.request_headers(url) if state else None, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException as error:
+            print(f"⚠️  {url}: {error}")
+            response = None
+        if response is not None and response.status_code not in RETRY_STATUSES:
+            return response
+        if attempt < retries:
+            time.sleep(retry_delay(attempt, backoff, response))
+    return response
+
+def page_found(url, response):
+    """False past the last page of a category (404). Any other failure raises, so the scrape stops before publishing
+    a truncated catalog and --resume can continue it from the checkpoint."""
+    if response is not None and response.status_code in (200, 304):
+        return True
+    if response is not None and response.status_code == 404:
+        return False
+    status = f"HTTP {response.status_code}" if response is not None else "sem resposta"
+    raise RuntimeError(f"Falha ao baixar {url} ({status})")
+
+def get_categories(base_url=BASE_URL, state=None, retries=3, backoff=0.5):
+    url = urljoin(base_url, "index.html")
+    res = fetch_page(url, state, retries, backoff)
+    if res is None or res.status_code not in (200, 304):
+        raise RuntimeError(f"Não foi possível carregar a lista de categorias de {base_url}")
+    return process_index_page(url, res, state)
+
+def scrape_serial(writer, base_url=BASE_URL, state=None, delay=SERIAL_DELAY, enricher=None, retries=3, backoff=0.5):
+    categories = get_categories(base_url, state, retries, backoff)
 
     for rel_url, category_name in categories.items():
+        category_url = category_page_url(rel_url, 1, base_url)
+        if writer.category_done(category_url):
+            continue
         page = 1
         while True:
-            if page == 1:
-                page_url = f"{IMAGE_PREFIX}{rel_url}"
-            else:
-                page_url = f"{IMAGE_PREFIX}{rel_url.replace('index.html', f'page-{page}.html')}"
-
-            res = requests.get(page_url)
-            if res.status_code != 200:
+            page_url = category_page_url(rel_url, page, base_url)
+            if writer.page_done(page_url):
+                page += 1
+                continue
+            res = fetch_page(page_url, state, retries, backoff)
+            if not page_found(page_url, res):
                 break
 
-            soup = BeautifulSoup(res.text, "html.parser")
-            articles = soup.select("article.product_pod")
+            articles, _ = process_category_page(page_url, res, category_name, base_url, state)
             if not articles:
                 break
-
-            for article in articles:
-                book = extract_book_data(article, category=category_name)
-                books.append(book)
+            if enricher is not None:
+                articles = enricher.enrich(articles)
+            writer.add_page(page_url, articles)
 
             page += 1
-            time.sleep(0.2)
+            time.sleep(delay)
+        writer.complete_category(category_url)
 
-    df = pd.DataFrame(books)
-    os.makedirs("data", exist_ok=True)
-    df.to_csv(OUTPUT_FILE, index=False)
-    print(f"✅ {len(df)} livros salvos em {OUTPUT_FILE}")
+def scrape(mode="serial", base_url=BASE_URL, output_file=OUTPUT_FILE, incremental=False, resume=False,
+           batch_size=DEFAULT_BATCH_SIZE, on_page=None, details=False, detail_concurrency=4, **mode_options) -> str:
+    """Scrape the catalog into output_file; on_page(book_count) is called for every page written."""
+    base_url = base_url.rstrip("/") + "/"
+    state = ScrapeState(output_file, columns=BOOK_COLUMNS) if incremental else None
+    enricher = None
+    if details:
+        from scripts.detail_enricher import DetailEnricher
+        enricher = DetailEnricher(output_file, detail_concurrency)
+    columns = BOOK_COLUMNS + (DETAIL_FIELDS if details else ())
+    writer = CatalogWriter(output_file, base_url, batch_size, resume, on_page, columns, {"stock": "Int64"} if details else None)
+    try:
+        if mode == "async":
+            # Imported lazily so the serial path keeps working without the async HTTP client installed
+            from scripts.async_scraper import scrape_async
+            scrape_async(writer, base_url, state=state, enricher=enricher, **mode_options)
+        else:
+            scrape_serial(writer, base_url, state, enricher=enricher, **mode_options)
+    finally:
+        # Also on failure: the catalog is left as it was and the pages already scraped stay checkpointed for --resume
+        writer.flush()
+
+    diff = diff_catalog_files(output_file, writer.partial_file)
+    if diff.is_empty() and os.path.exists(output_file):
+        writer.finish(publish=False)
+        print(f"✅ Nenhuma alteração no catálogo (versão {read_manifest(output_file)['version']})")
+    else:
+        writer.finish()
+        version = record_version(output_file, diff, writer.rows)
+        print(f"📦 Catálogo versão {version}: {diff.summary()}")
+    if state is not None:
+        state.save(writer.pages)
+    if enricher is not None:
+        enricher.save()
     return "Scraping concluído com sucesso!"
 
+def main():
+    parser = argparse.ArgumentParser(description="Scraper do catálogo books.toscrape.com")
+    parser.add_argument("--mode", choices=["serial", "async"], default="serial")
+    parser.add_argument("--base-url", default=BASE_URL, help="URL raiz do site (ex: servidor de fixtures local)")
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    parser.add_argument("--incremental", action="store_true", help="Reaproveita páginas não modificadas desde o último scraping")
+    parser.add_argument("--resume", action="store_true", help="Continua um scraping interrompido a partir do último checkpoint")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Livros gravados em disco por lote")
+    parser.add_argument("--details", action="store_true", help="Busca UPC, descrição e estoque na página de cada livro")
+    parser.add_argument("--detail-concurrency", type=int, default=4, help="Páginas de detalhe buscadas simultaneamente")
+    parser.add_argument("--delay", type=float, default=SERIAL_DELAY, help="Pausa em segundos entre páginas (modo serial)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requisições simultâneas por host (modo async)")
+    parser.add_argument("--rate", type=float, default=10.0, help="Requisições por segundo (modo async)")
+    parser.add_argument("--retries", type=int, default=3, help="Tentativas extras por página")
+    parser.add_argument("--parse-workers", type=int, default=0, help="Processos dedicados ao parsing; 0 faz o parsing no próprio processo (modo async)")
+    parser.add_argument("--categories-in-flight", type=int, default=4, help="Categorias baixadas à frente da que está sendo gravada (modo async)")
+    args = parser.parse_args()
+
+    if args.mode == "async":
+        mode_options = {"concurrency": args.concurrency, "rate": args.rate, "retries": args.retries, "parse_workers": args.parse_workers,
+                        "categories_in_flight": args.categories_in_flight}
+    else:
+        mode_options = {"delay": args.delay, "retries": args.retries}
+    scrape(args.mode, args.base_url, args.output, args.incremental, args.resume, args.batch_size,
+           details=args.details, detail_concurrency=args.detail_concurrency, **mode_options)
+
 if __name__ == "__main__":
-    scrape()
\ No newline at end of file
+    main()
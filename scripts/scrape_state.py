@@ -0,0 +1,86 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+STATE_FILE_NAME = "scrape_state.json"
+
+
+def content_hash(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+class ScrapeState:
+    """Validators, content hashes and results of the previous scrape, so unchanged pages are neither re-downloaded nor re-parsed."""
+
+    def __init__(self, catalog_file, state_file=None, columns=()):
+        self.state_file = state_file or os.path.join(os.path.dirname(catalog_file) or ".", STATE_FILE_NAME)
+        self.pages = {}
+        self.rows = {}
+        # Without the previous catalog there is nothing to reuse, so the run degrades to a full scrape
+        if os.path.exists(catalog_file) and os.path.exists(self.state_file):
+            with open(self.state_file, encoding="utf-8") as f:
+                self.pages = json.load(f)
+            df = pd.read_csv(catalog_file)
+            # Rows of a catalog written before a column existed can't be served as they are
+            if all(column in df.columns for column in columns):
+                self.rows = {str(row["id"]): row for row in df.astype(object).where(df.notna(), None).to_dict("records")}
+
+        self.seen = {}
+        self.not_modified = 0
+        self.unchanged = 0
+        self.parsed = 0
+
+    def _reusable(self, entry):
+        return all(book_id in self.rows for book_id in entry["data"].get("ids", []))
+
+    def request_headers(self, url):
+        """Conditional request headers for a page whose previous result can still be served."""
+        entry = self.pages.get(url)
+        if entry is None or not self._reusable(entry):
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def reuse(self, url, status_code, content):
+        """Previous result for a page that answered 304 or returned identical bytes; None when it must be parsed."""
+        entry = self.pages.get(url)
+        if entry is None or not self._reusable(entry):
+            return None
+        if status_code == 304:
+            self.not_modified += 1
+        elif status_code == 200 and content_hash(content) == entry["hash"]:
+            self.unchanged += 1
+        else:
+            return None
+        self.seen[url] = entry
+        return entry["data"]
+
+    def books(self, data):
+        return [dict(self.rows[book_id]) for book_id in data["ids"]]
+
+    def remember(self, url, headers, content, data):
+        self.parsed += 1
+        self.seen[url] = {
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "hash": content_hash(content),
+            "data": data
+        }
+
+    def save(self, done_pages=()):
+        """Write the state of the pages visited in this run, plus `done_pages` a resumed run skipped as already written."""
+        # Other pages are dropped, so pages that disappeared from the site are forgotten. A skipped page keeps its
+        # previous entry; if it changed meanwhile, its validators no longer match and the next run parses it again
+        pages = {url: self.pages[url] for url in done_pages if url in self.pages}
+        pages.update(self.seen)
+        tmp_file = f"{self.state_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(pages, f)
+        os.replace(tmp_file, self.state_file)
+        print(f"♻️  {self.not_modified} páginas não modificadas, {self.unchanged} com conteúdo idêntico, {self.parsed} processadas")
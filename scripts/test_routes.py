@@ -208,7 +208,20 @@ class APITester:
         
         # Filtro por faixa de preço
         results.append(self._make_request("GET", "/books/filter-by-price?min_price=20&max_price=35"))
-        
+
+        # Título curto demais para o índice de trigramas, com e sem ordenação: o total deve ser o mesmo
+        unsorted_result = self._make_request("GET", "/books/query?title=qu&limit=3")
+        sorted_result = self._make_request("GET", "/books/query?title=qu&sort=price&limit=3")
+        if unsorted_result.success and sorted_result.success:
+            unsorted_total = unsorted_result.response_data['total']
+            sorted_total = sorted_result.response_data['total']
+            titles = [book['title'].lower() for book in sorted_result.response_data['books']]
+            if sorted_total != unsorted_total or not all('qu' in title for title in titles):
+                sorted_result.success = False
+                sorted_result.error_message = f"Filtro de título ignorado com ordenação: total {sorted_total} != {unsorted_total}"
+        results.append(unsorted_result)
+        results.append(sorted_result)
+
         # Buscar livros por UUIDs válidos
         books_response = self._make_request("GET", "/books")
         if books_response.success and books_response.response_data: